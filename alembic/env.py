@@ -9,6 +9,8 @@ from sqlalchemy.engine import Connection
 from sqlalchemy.ext.asyncio import create_async_engine
 
 from infrastructure.db.models import Base
+from infrastructure.db.search import include_object
+from infrastructure.db.settings import DatabaseSettings
 
 config = context.config
 
@@ -20,11 +22,20 @@ sys.path.append(os.getcwd())
 target_metadata = Base.metadata
 
 
+def get_url() -> str:
+    """URL из alembic.ini, а если он не задан — из тех же настроек, что у приложения."""
+    return (
+        config.get_main_option("sqlalchemy.url")
+        or DatabaseSettings.from_env().database_url
+    )
+
+
 def run_migrations_offline() -> None:
-    url = config.get_main_option("sqlalchemy.url")
+    url = get_url()
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_object=include_object,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -34,17 +45,18 @@ def run_migrations_offline() -> None:
 
 
 def do_run_migrations(connection: Connection) -> None:
-    context.configure(connection=connection, target_metadata=target_metadata)
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        include_object=include_object,
+    )
 
     with context.begin_transaction():
         context.run_migrations()
 
 
 def run_migrations_online() -> None:
-    url = config.get_main_option("sqlalchemy.url")
-
-    if not url:
-        raise Exception("Database URL not found in alembic.ini")
+    url = get_url()
 
     async def run_async_migrations():
         connectable = create_async_engine(url, poolclass=pool.NullPool)
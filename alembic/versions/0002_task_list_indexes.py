@@ -0,0 +1,43 @@
+"""Срок задачи и составные индексы для списков задач
+
+Списки задач пользователя по id, с фильтром done и по сроку читаются
+диапазоном по (user_id, id), (user_id, done, id) и (user_id, due_date, id).
+Одиночный индекс по user_id заменяется на (user_id, id): в PostgreSQL
+он не дает порядка по id.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("tasks", sa.Column("due_date", sa.Date(), nullable=True))
+    op.create_index("ix_tasks_user_id_id", "tasks", ["user_id", "id"])
+    op.create_index("ix_tasks_user_id_done_id", "tasks", ["user_id", "done", "id"])
+    op.create_index(
+        "ix_tasks_user_id_due_date_id", "tasks", ["user_id", "due_date", "id"]
+    )
+    op.drop_index("ix_tasks_user_id", table_name="tasks")
+
+
+def downgrade() -> None:
+    op.create_index("ix_tasks_user_id", "tasks", ["user_id"])
+    op.drop_index("ix_tasks_user_id_due_date_id", table_name="tasks")
+    op.drop_index("ix_tasks_user_id_done_id", table_name="tasks")
+    op.drop_index("ix_tasks_user_id_id", table_name="tasks")
+
+    with op.batch_alter_table("tasks") as batch_op:
+        batch_op.drop_column("due_date")
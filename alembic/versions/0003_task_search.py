@@ -0,0 +1,65 @@
+"""Полнотекстовый поиск по тексту задач
+
+SQLite: внешняя FTS5-таблица tasks_fts над tasks.text, которую держат в
+синхронизации триггеры; существующие задачи индексируются командой rebuild.
+PostgreSQL: вычисляемая колонка search_vector (tsvector) с GIN-индексом.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "0003"
+down_revision: Union[str, None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name == "sqlite":
+        op.execute(
+            "CREATE VIRTUAL TABLE tasks_fts USING fts5("
+            "text, content='tasks', content_rowid='id', "
+            "tokenize='unicode61 remove_diacritics 2')"
+        )
+        op.execute(
+            "CREATE TRIGGER tasks_fts_ai AFTER INSERT ON tasks BEGIN "
+            "INSERT INTO tasks_fts(rowid, text) VALUES (new.id, new.text); END"
+        )
+        op.execute(
+            "CREATE TRIGGER tasks_fts_ad AFTER DELETE ON tasks BEGIN "
+            "INSERT INTO tasks_fts(tasks_fts, rowid, text) "
+            "VALUES ('delete', old.id, old.text); END"
+        )
+        op.execute(
+            "CREATE TRIGGER tasks_fts_au AFTER UPDATE OF text ON tasks BEGIN "
+            "INSERT INTO tasks_fts(tasks_fts, rowid, text) "
+            "VALUES ('delete', old.id, old.text); "
+            "INSERT INTO tasks_fts(rowid, text) VALUES (new.id, new.text); END"
+        )
+        op.execute("INSERT INTO tasks_fts(tasks_fts) VALUES ('rebuild')")
+    else:
+        op.execute(
+            "ALTER TABLE tasks ADD COLUMN search_vector tsvector "
+            "GENERATED ALWAYS AS (to_tsvector('russian', text)) STORED"
+        )
+        op.execute(
+            "CREATE INDEX ix_tasks_search_vector ON tasks USING gin (search_vector)"
+        )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "sqlite":
+        for trigger in ("tasks_fts_au", "tasks_fts_ad", "tasks_fts_ai"):
+            op.execute(f"DROP TRIGGER {trigger}")
+
+        op.execute("DROP TABLE tasks_fts")
+    else:
+        op.execute("DROP INDEX ix_tasks_search_vector")
+        op.execute("ALTER TABLE tasks DROP COLUMN search_vector")
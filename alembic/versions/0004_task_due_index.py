@@ -0,0 +1,28 @@
+"""Индекс незакрытых задач по сроку
+
+Незакрытые задачи всех пользователей со сроком до даты (GET /task/due и
+рассылка напоминаний) читаются одним диапазоном по (done, due_date, id).
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "0004"
+down_revision: Union[str, None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_tasks_done_due_date_id", "tasks", ["done", "due_date", "id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_tasks_done_due_date_id", table_name="tasks")
@@ -0,0 +1,43 @@
+"""Счетчики задач пользователя
+
+Таблица user_task_counts хранит число открытых и выполненных задач
+каждого пользователя; существующие задачи подсчитываются один раз.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0005"
+down_revision: Union[str, None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "user_task_counts",
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("open_count", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("done_count", sa.Integer(), server_default="0", nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("user_id"),
+    )
+    op.execute(
+        "INSERT INTO user_task_counts (user_id, open_count, done_count) "
+        "SELECT user_id, "
+        "SUM(CASE WHEN done THEN 0 ELSE 1 END), "
+        "SUM(CASE WHEN done THEN 1 ELSE 0 END) "
+        "FROM tasks GROUP BY user_id"
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("user_task_counts")
@@ -0,0 +1,65 @@
+"""ON DELETE CASCADE для задач и счетчиков пользователя
+
+Внешние ключи tasks.user_id и user_task_counts.user_id пересоздаются с
+ON DELETE CASCADE. В SQLite это пересборка таблиц в batch-режиме; триггеры
+полнотекстового индекса удаляются вместе со старой tasks и создаются заново.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "0006"
+down_revision: Union[str, None] = "0005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Имена для безымянных внешних ключей SQLite при пересборке таблиц
+NAMING_CONVENTION = {"fk": "%(table_name)s_%(column_0_name)s_fkey"}
+
+TABLES = ("tasks", "user_task_counts")
+
+FTS_TRIGGERS = (
+    "CREATE TRIGGER tasks_fts_ai AFTER INSERT ON tasks BEGIN "
+    "INSERT INTO tasks_fts(rowid, text) VALUES (new.id, new.text); END",
+    "CREATE TRIGGER tasks_fts_ad AFTER DELETE ON tasks BEGIN "
+    "INSERT INTO tasks_fts(tasks_fts, rowid, text) "
+    "VALUES ('delete', old.id, old.text); END",
+    "CREATE TRIGGER tasks_fts_au AFTER UPDATE OF text ON tasks BEGIN "
+    "INSERT INTO tasks_fts(tasks_fts, rowid, text) "
+    "VALUES ('delete', old.id, old.text); "
+    "INSERT INTO tasks_fts(rowid, text) VALUES (new.id, new.text); END",
+)
+
+
+def replace_user_foreign_keys(ondelete: Union[str, None]) -> None:
+    is_sqlite = op.get_bind().dialect.name == "sqlite"
+
+    for table in TABLES:
+        name = f"{table}_user_id_fkey"
+
+        with op.batch_alter_table(
+            table, naming_convention=NAMING_CONVENTION
+        ) as batch_op:
+            batch_op.drop_constraint(name, type_="foreignkey")
+            batch_op.create_foreign_key(
+                name, "users", ["user_id"], ["id"], ondelete=ondelete
+            )
+
+    if is_sqlite:
+        for trigger in FTS_TRIGGERS:
+            op.execute(trigger)
+
+
+def upgrade() -> None:
+    replace_user_foreign_keys("CASCADE")
+
+
+def downgrade() -> None:
+    replace_user_foreign_keys(None)
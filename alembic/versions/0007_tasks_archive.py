@@ -0,0 +1,55 @@
+"""Архив выполненных задач
+
+Колонка tasks.done_at хранит момент выполнения задачи; уже выполненным
+задачам проставляется время миграции. Таблица tasks_archive той же формы
+принимает задачи, выполненные больше заданного числа дней назад.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0007"
+down_revision: Union[str, None] = "0006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "tasks", sa.Column("done_at", sa.DateTime(timezone=True), nullable=True)
+    )
+    op.execute("UPDATE tasks SET done_at = CURRENT_TIMESTAMP WHERE done")
+    op.create_index("ix_tasks_done_done_at", "tasks", ["done", "done_at"], unique=False)
+
+    op.create_table(
+        "tasks_archive",
+        sa.Column("id", sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column("text", sa.String(), nullable=False),
+        sa.Column("done", sa.Boolean(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("due_date", sa.Date(), nullable=True),
+        sa.Column("done_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_tasks_archive_user_id_id",
+        "tasks_archive",
+        ["user_id", "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_tasks_archive_user_id_id", table_name="tasks_archive")
+    op.drop_table("tasks_archive")
+    op.drop_index("ix_tasks_done_done_at", table_name="tasks")
+    op.drop_column("tasks", "done_at")
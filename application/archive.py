@@ -0,0 +1,94 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Optional
+
+from infrastructure.db.database import open_session
+
+if TYPE_CHECKING:
+    from application.dependencies import TaskTrackerApp
+
+
+logger = logging.getLogger("task_tracker.archive")
+
+
+class TaskArchiver:
+    """
+    Фоновый перенос давно выполненных задач в архив.
+
+    Раз в interval_s задачи, выполненные больше after_days дней назад,
+    переносятся из tasks в tasks_archive пачками по batch_size, каждая
+    пачка — в своей транзакции. Горячая таблица и ее индексы по user_id
+    остаются небольшими, а запись не блокируется надолго. Несколько
+    процессов могут переносить задачи одновременно: пачки не пересекаются,
+    потому что строку забирает тот DELETE, который удалил ее первым.
+    """
+
+    def __init__(
+        self,
+        tracker: "TaskTrackerApp",
+        after_days: float,
+        batch_size: int = 1000,
+        interval_s: float = 3600,
+        pause_s: float = 0,
+    ) -> None:
+        if batch_size < 1:
+            raise ValueError("batch_size должен быть положительным")
+
+        self.tracker = tracker
+        self.after = timedelta(days=after_days)
+        self.batch_size = batch_size
+        self.interval = interval_s
+        self.pause = pause_s
+        self.archived = 0
+        self._worker: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._run())
+
+    async def close(self) -> None:
+        if self._worker is not None:
+            self._worker.cancel()
+
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+
+            self._worker = None
+
+    async def compact(self) -> int:
+        """Переносит в архив все задачи старше порога, возвращает их число."""
+        before = datetime.now(timezone.utc) - self.after
+        archived = 0
+
+        while True:
+            async with open_session():
+                moved = await self.tracker.tasks.archive_done(before, self.batch_size)
+
+            archived += len(moved)
+
+            if len(moved) < self.batch_size:
+                break
+
+            # Пауза между пачками отдает базу остальным писателям
+            await asyncio.sleep(self.pause)
+
+        self.archived += archived
+
+        return archived
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                archived = await self.compact()
+
+                if archived:
+                    logger.info("В архив перенесено задач: %s", archived)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Ошибка переноса задач в архив")
+
+            await asyncio.sleep(self.interval)
@@ -1,38 +1,124 @@
 from os import getenv
+from typing import Optional
 
 from dotenv import load_dotenv
-from fastapi import Depends, Security, HTTPException
+from fastapi import Depends, Request, Security, HTTPException
 from fastapi.security import APIKeyHeader
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from infrastructure.db.database import get_session
+from application.archive import TaskArchiver
+from application.purge import UserPurger
+from infrastructure.cache import InMemoryCacheBackend, LRUCache
+from infrastructure.db.database import (
+    AsyncSessionFactory,
+    RequestSession,
+    build_writer_engine,
+    get_session,
+    settings,
+)
+from infrastructure.db.write_pipeline import WritePipeline
+from task.cache import TaskCache
+from task.pipelined_repository import PipelinedTaskRepository
+from task.reminders import ReminderScheduler
 from task.sql_repository import SQLAlchemyTaskRepository, TaskRepository
+from user.cached_repository import CachedUserRepository
+from user.pipelined_repository import PipelinedUserRepository
 from user.sql_repository import SQLAlchemyUserRepository, UserRepository
 from user.app import UserService, UserApp
 from task.app import TaskService, TaskApp
 
 
-# 1. Зависимость для UserRepository (скрывает сложность SQLAlchemy)
-def get_user_repo(session: AsyncSession = Depends(get_session)) -> UserRepository:
-    return SQLAlchemyUserRepository(session)
-
-
-# 2. Зависимость для TaskRepository
-def get_task_repo(session: AsyncSession = Depends(get_session)) -> TaskRepository:
-    return SQLAlchemyTaskRepository(session)
-
-
-# 3. Зависимость для UserService (внедряет репозиторий, используя Протокол)
-def get_user_service(user_repo: UserRepository = Depends(get_user_repo)) -> UserService:
-    return UserService(user_repo)
-
+load_dotenv()
 
-# 4. Зависимость для TaskService (внедряет оба репозитория)
-def get_task_service(
-    task_repo: TaskRepository = Depends(get_task_repo),
-    user_repo: UserRepository = Depends(get_user_repo),
-) -> TaskService:
-    return TaskService(task_repo, user_repo)
+# Общий для процесса кэш связки telegram_id -> User
+telegram_user_cache = LRUCache(
+    maxsize=int(getenv("TELEGRAM_CACHE_SIZE", "10000")),
+    ttl=float(getenv("TELEGRAM_CACHE_TTL", "300")),
+)
+
+# Кэш задач по ID, по умолчанию выключен (TASK_CACHE_SIZE=0). Кэш в памяти
+# сбрасывается только в своем процессе, поэтому включать его стоит при одном
+# воркере или с общим бэкендом вроде Redis; иначе устаревшая задача живет до TTL
+TASK_CACHE_SIZE = int(getenv("TASK_CACHE_SIZE", "0"))
+task_cache = (
+    TaskCache(
+        InMemoryCacheBackend(LRUCache(maxsize=TASK_CACHE_SIZE)),
+        ttl=float(getenv("TASK_CACHE_TTL", "60")),
+    )
+    if TASK_CACHE_SIZE > 0
+    else None
+)
+
+# Очередь записи SQLite с групповым COMMIT (SQLITE_WRITE_PIPELINE=1)
+write_pipeline = (
+    WritePipeline(
+        build_writer_engine(settings),
+        max_batch=settings.sqlite_write_batch_size,
+        max_delay_ms=settings.sqlite_write_batch_delay_ms,
+    )
+    if settings.uses_sqlite_write_pipeline
+    else None
+)
+
+# Размер пачки задач при фоновом удалении пользователя (DELETE /user/{id}?background=true)
+USER_PURGE_BATCH_SIZE = int(getenv("USER_PURGE_BATCH_SIZE", "1000"))
+
+# Перенос задач, выполненных больше TASK_ARCHIVE_AFTER_DAYS дней назад, в архив;
+# без порога выключен
+TASK_ARCHIVE_AFTER_DAYS = getenv("TASK_ARCHIVE_AFTER_DAYS")
+TASK_ARCHIVE_BATCH_SIZE = int(getenv("TASK_ARCHIVE_BATCH_SIZE", "1000"))
+TASK_ARCHIVE_INTERVAL_S = float(getenv("TASK_ARCHIVE_INTERVAL_S", "3600"))
+
+# Рассылка напоминаний о сроках на вебхук (REMINDER_WEBHOOK_URL). Позиция рассылки
+# хранится в памяти процесса, поэтому планировщик запускается только там, где явно
+# включен REMINDER_SCHEDULER_ENABLED, — ровно в одном процессе, иначе каждое
+# напоминание уйдет столько раз, сколько запущено планировщиков
+REMINDER_WEBHOOK_URL = getenv("REMINDER_WEBHOOK_URL")
+REMINDER_SCHEDULER_ENABLED = getenv("REMINDER_SCHEDULER_ENABLED", "").lower() in (
+    "1",
+    "true",
+    "yes",
+)
+
+reminder_scheduler = (
+    ReminderScheduler(
+        AsyncSessionFactory,
+        SQLAlchemyTaskRepository,
+        REMINDER_WEBHOOK_URL,
+        batch_size=int(getenv("REMINDER_BATCH_SIZE", "100")),
+        heap_size=int(getenv("REMINDER_HEAP_SIZE", "1000")),
+    )
+    if REMINDER_WEBHOOK_URL and REMINDER_SCHEDULER_ENABLED
+    else None
+)
+
+
+def make_task_repo(session: AsyncSession) -> TaskRepository:
+    return SQLAlchemyTaskRepository(session, task_cache, reminder_scheduler)
+
+
+def make_user_repo(session: AsyncSession) -> UserRepository:
+    return SQLAlchemyUserRepository(session, task_cache, telegram_user_cache)
+
+
+# 1. Репозиторий пользователей (скрывает сложность SQLAlchemy)
+def build_user_repo(session: AsyncSession) -> UserRepository:
+    user_repo = make_user_repo(session)
+
+    if write_pipeline is not None:
+        user_repo = PipelinedUserRepository(user_repo, write_pipeline, make_user_repo)
+
+    return CachedUserRepository(user_repo, telegram_user_cache)
+
+
+# 2. Репозиторий задач
+def build_task_repo(session: AsyncSession) -> TaskRepository:
+    task_repo = make_task_repo(session)
+
+    if write_pipeline is not None:
+        task_repo = PipelinedTaskRepository(task_repo, write_pipeline, make_task_repo)
+
+    return task_repo
 
 
 class TaskTrackerApp:
@@ -41,17 +127,48 @@ class TaskTrackerApp:
     def __init__(self, user_service: UserService, task_service: TaskService):
         self.users = UserApp(user_service)
         self.tasks = TaskApp(task_service)
+        self.purger = UserPurger(self, batch_size=USER_PURGE_BATCH_SIZE)
 
 
-async def get_app_instance(
-    user_service: UserService = Depends(get_user_service),
-    task_service: TaskService = Depends(get_task_service),
-) -> TaskTrackerApp:
+# 3. Граф сервисов собирается один раз при старте (см. lifespan в main.py)
+def build_tracker_app() -> TaskTrackerApp:
+    """
+    Собирает репозитории, сервисы и фасад приложения.
 
-    return TaskTrackerApp(user_service=user_service, task_service=task_service)
+    Объекты не хранят состояния запроса: репозитории работают через
+    RequestSession, т.е. с сессией, открытой get_session для текущего запроса.
+    """
+    session = RequestSession()
+    user_repo = build_user_repo(session)
+    task_repo = build_task_repo(session)
 
+    return TaskTrackerApp(
+        user_service=UserService(user_repo),
+        task_service=TaskService(task_repo, user_repo),
+    )
+
+
+def build_task_archiver(tracker: TaskTrackerApp) -> Optional[TaskArchiver]:
+    """Фоновый архиватор задач, если задан TASK_ARCHIVE_AFTER_DAYS."""
+    if not TASK_ARCHIVE_AFTER_DAYS:
+        return None
+
+    return TaskArchiver(
+        tracker,
+        after_days=float(TASK_ARCHIVE_AFTER_DAYS),
+        batch_size=TASK_ARCHIVE_BATCH_SIZE,
+        interval_s=TASK_ARCHIVE_INTERVAL_S,
+    )
+
+
+# 4. Зависимость для маршрутов: открывает сессию запроса и отдает общий фасад
+async def get_app_instance(
+    request: Request, session: AsyncSession = Depends(get_session)
+) -> TaskTrackerApp:
+    # session не используется напрямую: get_session делает ее доступной
+    # репозиториям через RequestSession
+    return request.app.state.tracker
 
-load_dotenv()
 
 BOT_TOKEN = getenv("BOT_TOKEN")
 api_key_header = APIKeyHeader(name="Authorization", auto_error=False)
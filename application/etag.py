@@ -0,0 +1,32 @@
+from hashlib import blake2b
+from typing import Optional
+
+
+def make_etag(scope: str, version: str) -> str:
+    """Собирает значение заголовка ETag из области и версии."""
+    return f'"{scope}-{version}"'
+
+
+def make_scope(prefix: str, **params: object) -> str:
+    """
+    Область ETag для представления с параметрами (фильтры, страница).
+
+    Каждый набор параметров, меняющих ответ, получает свою область, чтобы
+    ETag одной страницы или одного фильтра не подходил к другим.
+    """
+    digest = blake2b(repr(sorted(params.items())).encode(), digest_size=6)
+
+    return f"{prefix}.{digest.hexdigest()}"
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Проверяет заголовок If-None-Match (слабое сравнение, RFC 9110)."""
+    if not if_none_match:
+        return False
+
+    if if_none_match.strip() == "*":
+        return True
+
+    candidates = (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+
+    return etag in candidates
@@ -0,0 +1,77 @@
+import asyncio
+import logging
+from typing import TYPE_CHECKING, Set
+
+from infrastructure.db.database import open_session
+
+if TYPE_CHECKING:
+    from application.dependencies import TaskTrackerApp
+
+
+logger = logging.getLogger("task_tracker.purge")
+
+
+class UserPurger:
+    """
+    Фоновое удаление пользователей с большими списками задач.
+
+    Задачи удаляются пачками по batch_size (сначала из tasks, затем из
+    архива), каждая пачка — в своей транзакции, поэтому одно удаление
+    не держит блокировку записи долго и не вытесняет остальные запросы.
+    После последней пачки пользователь удаляется обычным delete_user.
+    Незавершенная очистка (остановка процесса) безопасна: удаленные
+    пачки уже зафиксированы, а повторное удаление пользователя доводит
+    дело до конца.
+    """
+
+    def __init__(
+        self, tracker: "TaskTrackerApp", batch_size: int = 1000, pause_s: float = 0
+    ) -> None:
+        if batch_size < 1:
+            raise ValueError("batch_size должен быть положительным")
+
+        self.tracker = tracker
+        self.batch_size = batch_size
+        self.pause = pause_s
+        self._jobs: Set[asyncio.Task] = set()
+
+    def submit(self, user_id: int) -> None:
+        """Запускает очистку пользователя в фоне."""
+        job = asyncio.create_task(self._purge_logged(user_id))
+        self._jobs.add(job)
+        job.add_done_callback(self._jobs.discard)
+
+    async def purge(self, user_id: int) -> bool:
+        """Удаляет задачи пользователя пачками, затем самого пользователя."""
+        while True:
+            async with open_session():
+                deleted = await self.tracker.tasks.clear_tasks(
+                    user_id, limit=self.batch_size
+                )
+
+            if len(deleted) < self.batch_size:
+                break
+
+            # Пауза между пачками отдает базу остальным писателям
+            await asyncio.sleep(self.pause)
+
+        async with open_session():
+            return await self.tracker.users.delete_user(user_id)
+
+    async def drain(self) -> None:
+        """Дожидается завершения всех запущенных очисток."""
+        await asyncio.gather(*self._jobs, return_exceptions=True)
+
+    async def close(self) -> None:
+        jobs = list(self._jobs)
+
+        for job in jobs:
+            job.cancel()
+
+        await asyncio.gather(*jobs, return_exceptions=True)
+
+    async def _purge_logged(self, user_id: int) -> None:
+        try:
+            await self.purge(user_id)
+        except Exception:
+            logger.exception("Фоновое удаление пользователя %s не завершено", user_id)
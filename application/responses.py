@@ -0,0 +1,12 @@
+from fastapi.responses import Response
+
+
+class RawJSONResponse(Response):
+    """
+    Ответ с уже закодированным JSON.
+
+    Используется с сериализаторами из api/schema: тело кодируется
+    pydantic-core сразу в байты, минуя проверку response_model FastAPI.
+    """
+
+    media_type = "application/json"
@@ -0,0 +1,44 @@
+from functools import wraps
+from typing import Any, Callable
+
+from fastapi.responses import StreamingResponse
+from fastapi.routing import APIRoute
+
+from infrastructure.db.database import finish_session, request_session
+
+
+def finish_session_after(endpoint: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    Завершает сессию запроса, как только обработчик вернул результат.
+
+    Ответ сериализуется и отправляется уже без занятого соединения, а
+    ошибка COMMIT превращается в ответ с ошибкой вместо уже отправленного
+    успешного. Потоковые ответы читают из базы во время отправки, их
+    сессию по-прежнему закрывает get_session.
+
+    include_router пересоздает маршруты с тем же route_class, поэтому
+    уже обернутый обработчик возвращается как есть.
+    """
+    if getattr(endpoint, "__finishes_session__", False):
+        return endpoint
+
+    @wraps(endpoint)
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        result = await endpoint(*args, **kwargs)
+        session = request_session.get()
+
+        if session is not None and not isinstance(result, StreamingResponse):
+            await finish_session(session)
+
+        return result
+
+    wrapper.__finishes_session__ = True  # type: ignore[attr-defined]
+
+    return wrapper
+
+
+class SessionRoute(APIRoute):
+    """Маршрут, который освобождает сессию базы до сериализации ответа."""
+
+    def __init__(self, path: str, endpoint: Callable[..., Any], **kwargs: Any):
+        super().__init__(path, finish_session_after(endpoint), **kwargs)
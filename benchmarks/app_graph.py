@@ -0,0 +1,142 @@
+"""
+Стоимость сборки графа сервисов на каждый запрос.
+
+Сравнивает два одинаковых GET-маршрута без обращения к базе:
+- per-request: прежняя цепочка из шести вложенных Depends, которая
+  на каждый запрос создает репозитории, сервисы, UserApp, TaskApp и
+  TaskTrackerApp;
+- app-scoped: граф, собранный один раз (build_tracker_app), и
+  get_app_instance, который только открывает сессию запроса.
+
+Для каждого варианта печатает среднее и p95 время запроса через ASGI
+(в нем и разрешение зависимостей FastAPI) и число объектов, созданных
+запросом и живых к моменту вызова обработчика (по счетчику gc):
+
+    python -m benchmarks.app_graph --requests 5000
+"""
+
+import argparse
+import asyncio
+import gc
+from statistics import mean, quantiles
+from time import perf_counter
+
+import httpx
+from fastapi import Depends, FastAPI
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from application.dependencies import (
+    TaskTrackerApp,
+    build_task_repo,
+    build_tracker_app,
+    build_user_repo,
+    get_app_instance,
+)
+from infrastructure.db.database import get_session
+from task.service import TaskService
+from task.sql_repository import TaskRepository
+from user.service import UserService
+from user.sql_repository import UserRepository
+
+
+# Прежний граф: все объекты создаются заново на каждый запрос
+def get_user_repo(session: AsyncSession = Depends(get_session)) -> UserRepository:
+    return build_user_repo(session)
+
+
+def get_task_repo(session: AsyncSession = Depends(get_session)) -> TaskRepository:
+    return build_task_repo(session)
+
+
+def get_user_service(user_repo: UserRepository = Depends(get_user_repo)) -> UserService:
+    return UserService(user_repo)
+
+
+def get_task_service(
+    task_repo: TaskRepository = Depends(get_task_repo),
+    user_repo: UserRepository = Depends(get_user_repo),
+) -> TaskService:
+    return TaskService(task_repo, user_repo)
+
+
+async def get_per_request_app(
+    user_service: UserService = Depends(get_user_service),
+    task_service: TaskService = Depends(get_task_service),
+) -> TaskTrackerApp:
+    return TaskTrackerApp(user_service=user_service, task_service=task_service)
+
+
+# Число объектов под наблюдением gc в момент вызова обработчика;
+# считается только в фазе подсчета, когда сборщик выключен
+live_objects = []
+
+
+def count_live_objects() -> None:
+    if not gc.isenabled():
+        live_objects.append(len(gc.get_objects()))
+
+
+def make_app() -> FastAPI:
+    app = FastAPI()
+    app.state.tracker = build_tracker_app()
+
+    @app.get("/per-request")
+    async def per_request(tracker: TaskTrackerApp = Depends(get_per_request_app)):
+        count_live_objects()
+        return {"ok": tracker.tasks is not None}
+
+    @app.get("/app-scoped")
+    async def app_scoped(tracker: TaskTrackerApp = Depends(get_app_instance)):
+        count_live_objects()
+        return {"ok": tracker.tasks is not None}
+
+    return app
+
+
+async def measure(client: httpx.AsyncClient, path: str, requests: int):
+    # Прогрев: кэши FastAPI и pydantic
+    for _ in range(100):
+        await client.get(path)
+
+    timings = []
+
+    for _ in range(requests):
+        started = perf_counter()
+        await client.get(path)
+        timings.append(perf_counter() - started)
+
+    created = []
+    gc.disable()
+
+    for _ in range(200):
+        gc.collect()
+        before = len(gc.get_objects())
+        await client.get(path)
+        created.append(live_objects[-1] - before)
+
+    gc.enable()
+
+    return mean(timings) * 1e6, quantiles(timings, n=20)[-1] * 1e6, mean(created)
+
+
+async def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--requests", type=int, default=5000)
+    args = parser.parse_args()
+
+    transport = httpx.ASGITransport(app=make_app())
+
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench"
+    ) as client:
+        print(f"{'graph':>12} {'mean, us':>9} {'p95, us':>9} {'objects/req':>12}")
+
+        for path in ("/per-request", "/app-scoped"):
+            avg, p95, objects = await measure(client, path, args.requests)
+            print(f"{path.strip('/'):>12} {avg:>9.0f} {p95:>9.0f} {objects:>12.0f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,107 @@
+"""
+Память на материализацию задач в доменные объекты.
+
+Для каждого варианта в отдельном процессе создает count объектов Task
+из кортежей строк (как их отдает list_by_user) и печатает прирост RSS:
+- dict: обычные @dataclass с __dict__ и новый User на каждую строку
+  (прежняя модель и _db_to_domain_task);
+- slots, per-row user: слотовые dataclass, но User на каждую строку;
+- slots, shared user: текущие доменные классы и один User на результат.
+
+    python -m benchmarks.domain_memory --count 100000
+"""
+
+import argparse
+import gc
+import resource
+import subprocess
+import sys
+from dataclasses import dataclass
+from datetime import date
+from typing import Optional
+
+from task.domain.model import Task
+from user.domain.model import User
+
+
+VARIANTS = ("dict", "slots-per-row", "slots-shared")
+
+
+@dataclass
+class DictUser:
+    id: Optional[int]
+    telegram_id: Optional[int]
+
+
+@dataclass
+class DictTask:
+    id: Optional[int]
+    text: str
+    creator: DictUser
+    done: bool = False
+    due_date: Optional[date] = None
+
+
+def rss_kib() -> int:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    # На macOS ru_maxrss в байтах, на Linux — в килобайтах
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def materialize(variant: str, count: int) -> list:
+    rows = [(i, f"Задача номер {i}", i % 3 == 0) for i in range(count)]
+    gc.collect()
+    before = rss_kib()
+
+    if variant == "dict":
+        tasks = [
+            DictTask(id=id, text=text, done=done, creator=DictUser(1, 123456789))
+            for id, text, done in rows
+        ]
+    elif variant == "slots-per-row":
+        tasks = [
+            Task(id=id, text=text, done=done, creator=User(1, 123456789))
+            for id, text, done in rows
+        ]
+    else:
+        creator = User(1, 123456789)
+        tasks = [
+            Task(id=id, text=text, done=done, creator=creator)
+            for id, text, done in rows
+        ]
+
+    print(rss_kib() - before)
+
+    return tasks
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--count", type=int, default=100_000)
+    parser.add_argument("--variant", choices=VARIANTS)
+    args = parser.parse_args()
+
+    if args.variant:
+        materialize(args.variant, args.count)
+        return
+
+    print(f"{'variant':>14} {'RSS, MiB':>9} {'bytes/task':>11}")
+
+    for variant in VARIANTS:
+        # Каждый вариант в чистом процессе: RSS не возвращается ОС после free
+        output = subprocess.run(
+            [sys.executable, "-m", "benchmarks.domain_memory"]
+            + ["--variant", variant, "--count", str(args.count)],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        kib = int(output.strip())
+        print(f"{variant:>14} {kib / 1024:>9.1f} {kib * 1024 / args.count:>11.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Пропускная способность в зависимости от размера пула соединений.
+
+Запускает заданное число конкурентных "запросов", каждый из которых
+берет соединение из пула, выполняет типичный запрос списка задач и
+держит соединение hold_ms (имитация работы обработчика). Для каждого
+размера пула печатает запросы в секунду, p95 ожидания соединения и
+число таймаутов пула (QueuePool limit ... reached).
+
+Подключение и прочие параметры пула берутся из тех же переменных
+окружения, что и у приложения (DATABASE_URL, DB_POOL_TIMEOUT, ...):
+
+    python -m benchmarks.pool_size --sizes 1 2 5 10 20 --concurrency 50
+"""
+
+import argparse
+import asyncio
+from statistics import quantiles
+from time import perf_counter
+
+from sqlalchemy import select
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from infrastructure.db.database import build_engine
+from infrastructure.db.models import DBTask
+from infrastructure.db.settings import DatabaseSettings
+
+
+async def run(
+    settings: DatabaseSettings, concurrency: int, requests: int, hold_ms: float
+):
+    engine = build_engine(settings)
+    waits = []
+    timeouts = 0
+    queue = iter(range(requests))
+
+    async def worker():
+        nonlocal timeouts
+
+        for _ in queue:
+            started = perf_counter()
+
+            try:
+                async with engine.connect() as connection:
+                    waits.append(perf_counter() - started)
+                    await connection.execute(
+                        select(DBTask.id, DBTask.text, DBTask.done)
+                        .where(DBTask.user_id == 1)
+                        .limit(50)
+                    )
+                    await asyncio.sleep(hold_ms / 1000)
+            except PoolTimeoutError:
+                timeouts += 1
+
+    started = perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = perf_counter() - started
+    await engine.dispose()
+
+    p95 = quantiles(waits, n=20)[-1] * 1000 if len(waits) > 1 else 0.0
+
+    return requests / elapsed, p95, timeouts
+
+
+async def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 2, 5, 10, 20])
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--hold-ms", type=float, default=2.0)
+    args = parser.parse_args()
+
+    base = DatabaseSettings.from_env()
+    print(f"{'pool_size':>9} {'req/s':>10} {'p95 wait, ms':>13} {'timeouts':>9}")
+
+    for size in args.sizes:
+        settings = base.model_copy(update={"pool_size": size, "max_overflow": 0})
+        throughput, p95, timeouts = await run(
+            settings, args.concurrency, args.requests, args.hold_ms
+        )
+        print(f"{size:>9} {throughput:>10.0f} {p95:>13.2f} {timeouts:>9}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
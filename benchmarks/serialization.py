@@ -0,0 +1,99 @@
+"""
+Сериализация списка задач: путь response_model против TypeAdapter.
+
+Поднимает FastAPI-приложение без базы с тремя маршрутами, которые
+отдают один и тот же список доменных Task:
+- response_model: прежний путь — проверка List[TaskResponse] в FastAPI
+  и JSONResponse на стандартном json;
+- orjson: тот же response_model, но с ORJSONResponse (класс ответа
+  приложения по умолчанию);
+- adapter: dump_tasks (TypeAdapter) сразу в байты и RawJSONResponse.
+
+Для каждого размера списка печатает среднее время запроса через ASGI:
+
+    python -m benchmarks.serialization --sizes 1000 10000 --rounds 20
+"""
+
+import argparse
+import asyncio
+from time import perf_counter
+from typing import List
+
+import httpx
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse, ORJSONResponse
+
+from application.responses import RawJSONResponse
+from task.api.schema import TaskResponse, dump_tasks
+from task.domain.model import Task
+from user.domain.model import User
+
+
+def make_app(tasks: List[Task]) -> FastAPI:
+    app = FastAPI()
+
+    @app.get(
+        "/response_model",
+        response_model=List[TaskResponse],
+        response_class=JSONResponse,
+    )
+    async def response_model():
+        return tasks
+
+    @app.get(
+        "/orjson", response_model=List[TaskResponse], response_class=ORJSONResponse
+    )
+    async def orjson():
+        return tasks
+
+    @app.get("/adapter", response_model=List[TaskResponse])
+    async def adapter():
+        return RawJSONResponse(dump_tasks(tasks))
+
+    return app
+
+
+async def measure(client: httpx.AsyncClient, path: str, rounds: int) -> float:
+    await client.get(path)
+    started = perf_counter()
+
+    for _ in range(rounds):
+        response = await client.get(path)
+        response.raise_for_status()
+
+    return (perf_counter() - started) / rounds * 1000
+
+
+async def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    creator = User(id=1, telegram_id=123456789)
+    print(
+        f"{'tasks':>6} {'response_model, ms':>19} {'orjson, ms':>11} {'adapter, ms':>12}"
+    )
+
+    for size in args.sizes:
+        tasks = [
+            Task(id=i, text=f"Задача номер {i}", creator=creator, done=i % 3 == 0)
+            for i in range(1, size + 1)
+        ]
+        transport = httpx.ASGITransport(app=make_app(tasks))
+
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://bench"
+        ) as client:
+            timings = [
+                await measure(client, path, args.rounds)
+                for path in ("/response_model", "/orjson", "/adapter")
+            ]
+
+        print(f"{size:>6} {timings[0]:>19.1f} {timings[1]:>11.1f} {timings[2]:>12.1f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,116 @@
+"""
+Пропускная способность SQLite до и после продакшен-профиля.
+
+Смешанная нагрузка на временный файл базы: несколько писателей
+создают задачи (каждая — отдельная транзакция), а читатели в это
+время запрашивают список задач пользователя. Сравниваются:
+
+* baseline — журнал по умолчанию, без PRAGMA, один общий пул;
+* profile  — WAL, synchronous=NORMAL, busy_timeout, mmap/cache/temp_store
+  и отдельный пул только для чтения.
+
+    python -m benchmarks.sqlite_profile --seconds 5 --writers 4 --readers 16
+"""
+
+import argparse
+import asyncio
+from os import path
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+from sqlalchemy import insert, select
+from sqlalchemy.exc import OperationalError
+
+from infrastructure.db.database import build_engine
+from infrastructure.db.models import Base, DBTask, DBUser
+from infrastructure.db.settings import DatabaseSettings
+
+
+async def run(settings: DatabaseSettings, seconds: float, writers: int, readers: int):
+    engine = build_engine(settings)
+    read_engine = (
+        build_engine(settings, read_only=True)
+        if settings.uses_sqlite_reader_pool
+        else engine
+    )
+
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+        await connection.execute(insert(DBUser).values(id=1, telegram_id=1))
+        await connection.execute(
+            insert(DBTask), [{"text": f"seed {i}", "user_id": 1} for i in range(1000)]
+        )
+
+    counters = {"writes": 0, "reads": 0, "locked": 0}
+    deadline = perf_counter() + seconds
+
+    async def writer():
+        while perf_counter() < deadline:
+            try:
+                async with engine.begin() as connection:
+                    await connection.execute(
+                        insert(DBTask).values(text="bench", user_id=1)
+                    )
+                counters["writes"] += 1
+            except OperationalError:
+                counters["locked"] += 1
+
+    async def reader():
+        while perf_counter() < deadline:
+            try:
+                async with read_engine.connect() as connection:
+                    result = await connection.execute(
+                        select(DBTask.id, DBTask.text, DBTask.done)
+                        .where(DBTask.user_id == 1)
+                        .order_by(DBTask.id.desc())
+                        .limit(50)
+                    )
+                    result.all()
+                counters["reads"] += 1
+            except OperationalError:
+                counters["locked"] += 1
+
+    await asyncio.gather(
+        *(writer() for _ in range(writers)), *(reader() for _ in range(readers))
+    )
+
+    await engine.dispose()
+    await read_engine.dispose()
+
+    return {key: value / seconds for key, value in counters.items()}
+
+
+async def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--readers", type=int, default=16)
+    args = parser.parse_args()
+
+    profiles = {
+        "baseline": {"sqlite_profile": False, "sqlite_reader_pool_size": 0},
+        "profile": {"sqlite_reader_pool_size": args.readers},
+    }
+
+    print(f"{'':>9} {'writes/s':>9} {'reads/s':>9} {'locked/s':>9}")
+
+    for name, overrides in profiles.items():
+        with TemporaryDirectory() as tmp:
+            url = f"sqlite+aiosqlite:///{path.join(tmp, 'bench.db')}"
+            settings = DatabaseSettings(
+                database_url=url,
+                pool_size=args.writers + args.readers,
+                max_overflow=0,
+                **overrides,
+            )
+            rates = await run(settings, args.seconds, args.writers, args.readers)
+
+        print(
+            f"{name:>9} {rates['writes']:>9.0f} {rates['reads']:>9.0f} {rates['locked']:>9.1f}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
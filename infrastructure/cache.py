@@ -0,0 +1,91 @@
+from collections import OrderedDict
+from time import monotonic
+from typing import Any, Hashable, Optional, Protocol, Tuple
+
+
+class LRUCache:
+    """
+    Ограниченный по размеру in-process кэш с вытеснением LRU и TTL.
+
+    Считает попадания и промахи, чтобы было видно, окупается ли кэш.
+    """
+
+    def __init__(self, maxsize: int = 10_000, ttl: Optional[float] = None) -> None:
+        if maxsize <= 0:
+            raise ValueError("maxsize должен быть положительным")
+
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[Hashable, Tuple[Any, Optional[float]]]" = OrderedDict()
+
+    def get(self, key: Hashable) -> Any:
+        """Возвращает значение или None, если его нет или оно устарело."""
+        entry = self._data.get(key)
+
+        if entry is not None:
+            value, expires_at = entry
+
+            if expires_at is None or expires_at > monotonic():
+                self._data.move_to_end(key)
+                self.hits += 1
+                return value
+
+            del self._data[key]
+
+        self.misses += 1
+        return None
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = monotonic() + ttl if ttl is not None else None
+        self._data[key] = (value, expires_at)
+        self._data.move_to_end(key)
+
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key: Hashable) -> None:
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> dict:
+        return {"size": len(self._data), "hits": self.hits, "misses": self.misses}
+
+
+class CacheBackend(Protocol):
+    """
+    Внешнее хранилище кэша со строковыми ключами и значениями.
+
+    Интерфейс повторяет подмножество команд Redis (GET / SET EX / DEL),
+    поэтому Redis-совместимый клиент реализует его тонкой оберткой.
+    """
+
+    async def get(self, key: str) -> Optional[str]: ...
+
+    async def set(self, key: str, value: str, ttl: Optional[float] = None) -> None: ...
+
+    async def delete(self, *keys: str) -> None: ...
+
+
+class InMemoryCacheBackend(CacheBackend):
+    """Реализация CacheBackend поверх LRUCache внутри процесса."""
+
+    def __init__(self, cache: LRUCache) -> None:
+        self.cache = cache
+
+    async def get(self, key: str) -> Optional[str]:
+        return self.cache.get(key)
+
+    async def set(self, key: str, value: str, ttl: Optional[float] = None) -> None:
+        self.cache.set(key, value, ttl)
+
+    async def delete(self, *keys: str) -> None:
+        for key in keys:
+            self.cache.pop(key)
@@ -1,8 +1,20 @@
+from datetime import date, datetime
 from typing import Optional
 
-from sqlalchemy import Integer, String, Boolean, ForeignKey, BIGINT
+from sqlalchemy import (
+    Integer,
+    String,
+    Boolean,
+    Date,
+    DateTime,
+    ForeignKey,
+    Index,
+    BIGINT,
+)
 from sqlalchemy.orm import relationship, DeclarativeBase, Mapped, mapped_column
 
+from infrastructure.db.search import install_search_ddl
+
 
 class Base(DeclarativeBase):
     pass
@@ -17,7 +29,8 @@ class DBUser(Base):
     telegram_id: Mapped[Optional[int]] = mapped_column(
         BIGINT, unique=True, index=True, nullable=True
     )
-    tasks = relationship("DBTask", back_populates="creator")
+    # Задачи удаляет база (ON DELETE CASCADE), ORM их не загружает
+    tasks = relationship("DBTask", back_populates="creator", passive_deletes=True)
 
 
 class DBTask(Base):
@@ -29,6 +42,80 @@ class DBTask(Base):
     text: Mapped[str] = mapped_column(String, nullable=False)
     done: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
     user_id: Mapped[int] = mapped_column(
-        Integer, ForeignKey("users.id"), nullable=False, index=True
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+    )
+    due_date: Mapped[Optional[date]] = mapped_column(Date, nullable=True)
+    # Момент выполнения (UTC); NULL у открытых задач
+    done_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), nullable=True
     )
     creator = relationship("DBUser", back_populates="tasks")
+
+    # Списки задач пользователя читаются диапазоном по этим индексам:
+    # порядок по id, фильтр done с порядком по id и порядок по сроку
+    # (см. list_by_user); незакрытые задачи всех пользователей по сроку —
+    # по (done, due_date, id) (см. list_due), давно выполненные задачи для
+    # переноса в архив — по (done, done_at) (см. archive_done)
+    __table_args__ = (
+        Index("ix_tasks_user_id_id", "user_id", "id"),
+        Index("ix_tasks_user_id_done_id", "user_id", "done", "id"),
+        Index("ix_tasks_user_id_due_date_id", "user_id", "due_date", "id"),
+        Index("ix_tasks_done_due_date_id", "done", "due_date", "id"),
+        Index("ix_tasks_done_done_at", "done", "done_at"),
+    )
+
+
+class DBTaskArchive(Base):
+    """
+    Архив давно выполненных задач.
+
+    Та же форма, что у tasks, и те же ID: задачи переносятся сюда пачками
+    (см. archive_done), чтобы горячая таблица и ее индексы по user_id
+    содержали в основном актуальные задачи. Полнотекстовый индекс архив
+    не покрывает.
+    """
+
+    __tablename__ = "tasks_archive"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=False)
+    text: Mapped[str] = mapped_column(String, nullable=False)
+    done: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
+    user_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+    )
+    due_date: Mapped[Optional[date]] = mapped_column(Date, nullable=True)
+    done_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+
+    __table_args__ = (Index("ix_tasks_archive_user_id_id", "user_id", "id"),)
+
+
+class DBUserTaskCounts(Base):
+    """
+    Счетчики задач пользователя (открытые и выполненные).
+
+    Обновляются репозиторием задач в той же транзакции, что и сами задачи,
+    чтобы статистика читалась одной строкой без COUNT(*) по tasks.
+    version растет при каждом изменении списка задач пользователя и
+    служит версией для ETag, общей для всех процессов приложения.
+    """
+
+    __tablename__ = "user_task_counts"
+
+    user_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+    )
+    open_count: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
+    done_count: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
+    version: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
+
+
+# Полнотекстовый поиск по tasks.text (FTS5 в SQLite, tsvector в PostgreSQL)
+install_search_ddl(DBTask.__table__)
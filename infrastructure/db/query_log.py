@@ -0,0 +1,131 @@
+import logging
+import re
+from contextvars import ContextVar
+from hashlib import sha1
+from random import random
+from time import perf_counter
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+logger = logging.getLogger("task_tracker.slow_query")
+
+# ASGI scope текущего запроса: по нему определяется маршрут, выполнивший запрос к БД
+current_scope: ContextVar[Optional[dict]] = ContextVar("current_scope", default=None)
+
+_WHITESPACE = re.compile(r"\s+")
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_POSITIONAL_PARAM = re.compile(r"\$\d+|%\(\w+\)s|:\w+|\?")
+_PARAM_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_VALUES_LIST = re.compile(r"VALUES\s*\(\.\.\.\)(?:\s*,\s*\(\.\.\.\))*", re.IGNORECASE)
+
+
+def normalize_statement(statement: str) -> str:
+    """Приводит SQL к виду без литералов и параметров, чтобы группировать запросы."""
+    normalized = _WHITESPACE.sub(" ", statement).strip()
+    normalized = _STRING_LITERAL.sub("?", normalized)
+    normalized = _POSITIONAL_PARAM.sub("?", normalized)
+    normalized = _NUMBER_LITERAL.sub("?", normalized)
+    normalized = _PARAM_LIST.sub("(...)", normalized)
+
+    return _VALUES_LIST.sub("VALUES (...)", normalized)
+
+
+def fingerprint(statement: str) -> str:
+    """Короткий отпечаток нормализованного запроса."""
+    return sha1(normalize_statement(statement).encode()).hexdigest()[:12]
+
+
+def current_route() -> Optional[str]:
+    """Маршрут текущего HTTP-запроса (шаблон пути, а не конкретный URL)."""
+    scope = current_scope.get()
+
+    if scope is None:
+        return None
+
+    route = scope.get("route")
+    path = getattr(route, "path", None) or scope.get("path")
+
+    return f"{scope.get('method')} {path}"
+
+
+class QueryRouteMiddleware:
+    """ASGI-middleware, делающее маршрут запроса видимым для журнала запросов."""
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        token = current_scope.set(scope)
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            current_scope.reset(token)
+
+
+class SlowQueryLog:
+    """
+    Журнал медленных запросов на событиях before/after_cursor_execute.
+
+    В журнал попадают запросы дольше threshold_ms, и из них только доля
+    sample_rate, чтобы под нагрузкой логирование не стало узким местом.
+
+    Время начала хранится в контексте выполнения конкретного запроса, а не
+    в соединении: after_cursor_execute не вызывается для упавших запросов,
+    и стек в conn.info копил бы их отметки и сдвигал замеры следующих.
+    """
+
+    def __init__(self, threshold_ms: float, sample_rate: float = 1.0) -> None:
+        if threshold_ms < 0:
+            raise ValueError("threshold_ms не может быть отрицательным")
+
+        if not 0 <= sample_rate <= 1:
+            raise ValueError("sample_rate должен быть в диапазоне [0, 1]")
+
+        self.threshold = threshold_ms / 1000
+        self.sample_rate = sample_rate
+
+    def install(self, engine: Engine) -> None:
+        event.listen(engine, "before_cursor_execute", self._before)
+        event.listen(engine, "after_cursor_execute", self._after)
+
+    def remove(self, engine: Engine) -> None:
+        event.remove(engine, "before_cursor_execute", self._before)
+        event.remove(engine, "after_cursor_execute", self._after)
+
+    def _before(self, conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            context._query_start = perf_counter()
+
+    def _after(self, conn, cursor, statement, parameters, context, executemany):
+        start = getattr(context, "_query_start", None)
+
+        if start is None:
+            return
+
+        elapsed = perf_counter() - start
+
+        if elapsed < self.threshold or random() >= self.sample_rate:
+            return
+
+        route = current_route()
+        logger.warning(
+            "slow query %.1f ms [%s] route=%s: %s",
+            elapsed * 1000,
+            fingerprint(statement),
+            route,
+            normalize_statement(statement)[:500],
+            extra={
+                "duration_ms": elapsed * 1000,
+                "fingerprint": fingerprint(statement),
+                "route": route,
+            },
+        )
@@ -0,0 +1,41 @@
+from typing import Iterable, Mapping
+
+from infrastructure.cache import LRUCache
+
+
+# Параметры пути и запроса, по которым видно, чьи данные читает запрос
+ROUTING_PARAMS = {"user_id": "user", "task_id": "task"}
+
+
+class RecentWrites:
+    """
+    Окно "читаю свои записи" для реплики.
+
+    Реплика отстает от основной базы, поэтому после записи пользователь
+    может не увидеть свои изменения. Недавно измененные пользователи и
+    задачи запоминаются на window_s секунд, и чтения по ним идут в
+    основную базу. Состояние живет в процессе, поэтому между несколькими
+    воркерами окно не разделяется.
+    """
+
+    def __init__(self, window_s: float, maxsize: int = 100_000) -> None:
+        self._seen = LRUCache(maxsize, ttl=window_s)
+
+    def mark(self, scope: str, ids: Iterable[int]) -> None:
+        for id in ids:
+            self._seen.set((scope, id), True)
+
+    def is_recent(self, scope: str, id: int) -> bool:
+        return self._seen.get((scope, id)) is not None
+
+    def covers(self, *params: Mapping[str, str]) -> bool:
+        """Проверяет, читает ли запрос с такими параметрами недавние записи."""
+        for values in params:
+            for name, scope in ROUTING_PARAMS.items():
+                value = values.get(name)
+
+                if value is not None and str(value).isdigit():
+                    if self.is_recent(scope, int(value)):
+                        return True
+
+        return False
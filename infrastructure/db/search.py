@@ -0,0 +1,86 @@
+import re
+from typing import Optional
+
+from sqlalchemy import DDL, Float, Integer, Table, event
+from sqlalchemy.sql import column, table
+
+
+# Конфигурация полнотекстового поиска PostgreSQL (стемминг русских слов)
+SEARCH_CONFIG = "russian"
+
+# SQLite: внешняя FTS5-таблица над tasks.text, синхронизируется триггерами
+FTS_TABLE = "tasks_fts"
+tasks_fts = table(FTS_TABLE, column("rowid", Integer), column("rank", Float))
+
+SQLITE_SEARCH_DDL = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+    "text, content='tasks', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2')",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON tasks BEGIN "
+    f"INSERT INTO {FTS_TABLE}(rowid, text) VALUES (new.id, new.text); END",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON tasks BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, text) "
+    "VALUES ('delete', old.id, old.text); END",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF text ON tasks BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, text) "
+    "VALUES ('delete', old.id, old.text); "
+    f"INSERT INTO {FTS_TABLE}(rowid, text) VALUES (new.id, new.text); END",
+)
+
+# PostgreSQL: вычисляемая колонка tsvector с GIN-индексом
+SEARCH_VECTOR = "search_vector"
+SEARCH_INDEX = "ix_tasks_search_vector"
+
+POSTGRES_SEARCH_DDL = (
+    f"ALTER TABLE tasks ADD COLUMN {SEARCH_VECTOR} tsvector "
+    f"GENERATED ALWAYS AS (to_tsvector('{SEARCH_CONFIG}', text)) STORED",
+    f"CREATE INDEX {SEARCH_INDEX} ON tasks USING gin ({SEARCH_VECTOR})",
+)
+
+
+def install_search_ddl(tasks: Table) -> None:
+    """
+    Добавляет объекты поиска к create_all/drop_all таблицы задач.
+
+    В продакшене их создает миграция; это нужно для баз, которые
+    создаются из моделей (тесты, локальная разработка).
+    """
+    for statement in SQLITE_SEARCH_DDL:
+        event.listen(tasks, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+
+    for statement in POSTGRES_SEARCH_DDL:
+        event.listen(
+            tasks, "after_create", DDL(statement).execute_if(dialect="postgresql")
+        )
+
+    # FTS5-таблица не зависит от tasks и сама с ней не удаляется
+    event.listen(
+        tasks,
+        "before_drop",
+        DDL(f"DROP TABLE IF EXISTS {FTS_TABLE}").execute_if(dialect="sqlite"),
+    )
+
+
+def include_object(
+    object, name: Optional[str], type_: str, reflected, compare_to
+) -> bool:
+    """Фильтр autogenerate Alembic: объекты поиска не описаны в моделях."""
+    if type_ == "table" and name is not None and name.startswith(FTS_TABLE):
+        return False
+
+    return name not in (SEARCH_VECTOR, SEARCH_INDEX)
+
+
+def fts5_query(text: str) -> Optional[str]:
+    """
+    Безопасный запрос MATCH из пользовательского текста.
+
+    Каждое слово берется в кавычки как префикс ("молок"* найдет
+    "молоко"), слова объединяются через AND. Без слов — None.
+    """
+    words = re.findall(r"\w+", text)
+
+    if not words:
+        return None
+
+    return " ".join(f'"{word}"*' for word in words)
@@ -0,0 +1,184 @@
+from json import loads
+from os import getenv
+from typing import Any, Dict, Optional
+
+from pydantic import BaseModel, Field, field_validator, model_validator
+from sqlalchemy.engine import make_url
+
+
+SQLITE_DB_URL = "sqlite+aiosqlite:///./task_tracker.db"
+
+# Имена переменных окружения для полей DatabaseSettings
+ENV_VARS = {
+    "database_url": "DATABASE_URL",
+    "replica_url": "DATABASE_REPLICA_URL",
+    "read_your_writes_s": "DB_READ_YOUR_WRITES_SECONDS",
+    "echo": "DB_ECHO",
+    "pool_size": "DB_POOL_SIZE",
+    "max_overflow": "DB_MAX_OVERFLOW",
+    "pool_timeout": "DB_POOL_TIMEOUT",
+    "pool_recycle": "DB_POOL_RECYCLE",
+    "pool_pre_ping": "DB_POOL_PRE_PING",
+    "statement_cache_size": "DB_STATEMENT_CACHE_SIZE",
+    "connect_args": "DB_CONNECT_ARGS",
+    "slow_query_ms": "SLOW_QUERY_MS",
+    "slow_query_sample_rate": "SLOW_QUERY_SAMPLE_RATE",
+    "sqlite_profile": "SQLITE_PROFILE",
+    "sqlite_busy_timeout_ms": "SQLITE_BUSY_TIMEOUT_MS",
+    "sqlite_mmap_size": "SQLITE_MMAP_SIZE",
+    "sqlite_cache_size_kib": "SQLITE_CACHE_SIZE_KIB",
+    "sqlite_reader_pool_size": "SQLITE_READER_POOL_SIZE",
+    "sqlite_write_pipeline": "SQLITE_WRITE_PIPELINE",
+    "sqlite_write_batch_size": "SQLITE_WRITE_BATCH_SIZE",
+    "sqlite_write_batch_delay_ms": "SQLITE_WRITE_BATCH_DELAY_MS",
+}
+
+
+class DatabaseSettings(BaseModel):
+    """
+    Настройки подключения к базе и пула соединений.
+
+    Читаются из окружения один раз при старте (см. from_env) и
+    валидируются сразу, чтобы ошибка конфигурации роняла запуск,
+    а не первый запрос под нагрузкой.
+    """
+
+    database_url: str = Field(repr=False)  # содержит учетные данные
+    # Реплика для GET-маршрутов и окно чтения своих записей (0 — выключено)
+    replica_url: Optional[str] = Field(None, repr=False)
+    read_your_writes_s: float = Field(0, ge=0)
+    echo: bool = False
+    pool_size: int = Field(5, ge=1)
+    max_overflow: int = Field(10, ge=0)
+    pool_timeout: float = Field(30, gt=0)
+    pool_recycle: int = Field(1800, ge=-1)  # -1 — не пересоздавать соединения
+    pool_pre_ping: bool = True
+    statement_cache_size: int = Field(100, ge=0)  # кэш prepared statements asyncpg
+    connect_args: Dict[str, Any] = Field(default_factory=dict)
+    slow_query_ms: Optional[float] = Field(None, ge=0)
+    slow_query_sample_rate: float = Field(1.0, ge=0, le=1)
+
+    # Продакшен-профиль SQLite: WAL и PRAGMA на каждом новом соединении
+    sqlite_profile: bool = True
+    sqlite_busy_timeout_ms: int = Field(5000, ge=0)
+    sqlite_mmap_size: int = Field(256 * 1024 * 1024, ge=0)
+    sqlite_cache_size_kib: int = Field(64 * 1024, ge=0)
+    # Отдельный пул только для чтения под GET-маршруты (0 — выключен)
+    sqlite_reader_pool_size: int = Field(5, ge=0)
+    # Все записи через одно соединение-писатель с групповым COMMIT
+    sqlite_write_pipeline: bool = False
+    sqlite_write_batch_size: int = Field(64, ge=1)
+    sqlite_write_batch_delay_ms: float = Field(2, ge=0)
+
+    @field_validator("connect_args", mode="before")
+    @classmethod
+    def parse_connect_args(cls, value: Any) -> Any:
+        if isinstance(value, str):
+            return loads(value) if value else {}
+
+        return value
+
+    @model_validator(mode="after")
+    def check_driver(self):
+        for url in (self.database_url, self.replica_url):
+            if url is None:
+                continue
+
+            backend = make_url(url).get_backend_name()
+
+            if backend not in ("sqlite", "postgresql"):
+                raise ValueError(f"Неподдерживаемая база данных: {backend}")
+
+        return self
+
+    @classmethod
+    def from_env(cls) -> "DatabaseSettings":
+        values = {
+            field: getenv(env_var)
+            for field, env_var in ENV_VARS.items()
+            if getenv(env_var) not in (None, "")
+        }
+
+        if "database_url" not in values:
+            if getenv("DB_TYPE", "sqlite") == "postgres":
+                raise ValueError("Для DB_TYPE=postgres нужно задать DATABASE_URL")
+
+            values["database_url"] = SQLITE_DB_URL
+
+        return cls(**values)
+
+    @property
+    def is_sqlite(self) -> bool:
+        return make_url(self.database_url).get_backend_name() == "sqlite"
+
+    @property
+    def is_sqlite_file(self) -> bool:
+        return self.is_sqlite and make_url(self.database_url).database not in (
+            None,
+            "",
+            ":memory:",
+        )
+
+    @property
+    def uses_sqlite_reader_pool(self) -> bool:
+        return self.is_sqlite_file and self.sqlite_reader_pool_size > 0
+
+    @property
+    def uses_sqlite_write_pipeline(self) -> bool:
+        return self.is_sqlite_file and self.sqlite_write_pipeline
+
+    @property
+    def is_postgres(self) -> bool:
+        return make_url(self.database_url).get_backend_name() == "postgresql"
+
+    @property
+    def is_asyncpg(self) -> bool:
+        driver = make_url(self.database_url).get_driver_name()
+
+        return self.is_postgres and driver == "asyncpg"
+
+    def replica_settings(self) -> Optional["DatabaseSettings"]:
+        """Настройки движка реплики или None, если реплика не задана."""
+        if self.replica_url is None:
+            return None
+
+        return self.model_copy(
+            update={"database_url": self.replica_url, "replica_url": None}
+        )
+
+    def engine_kwargs(self, read_only: bool = False) -> Dict[str, Any]:
+        """Аргументы create_async_engine для этих настроек."""
+        connect_args = dict(self.connect_args)
+        kwargs: Dict[str, Any] = {
+            "echo": self.echo,
+            "pool_pre_ping": self.pool_pre_ping,
+        }
+
+        # In-memory SQLite живет на одном соединении (StaticPool) без параметров пула
+        if not self.is_sqlite or self.is_sqlite_file:
+            reader_pool = read_only and self.is_sqlite
+            kwargs.update(
+                pool_size=(
+                    self.sqlite_reader_pool_size if reader_pool else self.pool_size
+                ),
+                max_overflow=self.max_overflow,
+                pool_timeout=self.pool_timeout,
+                pool_recycle=self.pool_recycle,
+            )
+
+        # statement_cache_size и server_settings понимает только asyncpg;
+        # остальным драйверам PostgreSQL параметры сервера передаются через libpq
+        if self.is_asyncpg:
+            connect_args.setdefault("statement_cache_size", self.statement_cache_size)
+
+            if read_only:
+                # Реплика не должна принимать записи даже по ошибке маршрутизации
+                server_settings = dict(connect_args.get("server_settings", {}))
+                server_settings.setdefault("default_transaction_read_only", "on")
+                connect_args["server_settings"] = server_settings
+        elif self.is_postgres and read_only:
+            connect_args.setdefault("options", "-c default_transaction_read_only=on")
+
+        kwargs["connect_args"] = connect_args
+
+        return kwargs
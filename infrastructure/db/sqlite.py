@@ -0,0 +1,65 @@
+from typing import List
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from infrastructure.db.settings import DatabaseSettings
+
+
+def sqlite_pragmas(settings: DatabaseSettings, read_only: bool = False) -> List[str]:
+    """PRAGMA, выполняемые на каждом новом соединении с файлом SQLite."""
+    # Без этого SQLite не проверяет внешние ключи и не выполняет ON DELETE CASCADE
+    pragmas = ["PRAGMA foreign_keys=ON"]
+
+    if settings.sqlite_profile:
+        if not read_only:
+            # journal_mode хранится в самом файле, его достаточно выставлять писателю
+            pragmas += ["PRAGMA journal_mode=WAL", "PRAGMA synchronous=NORMAL"]
+
+        pragmas += [
+            f"PRAGMA busy_timeout={settings.sqlite_busy_timeout_ms}",
+            f"PRAGMA mmap_size={settings.sqlite_mmap_size}",
+            f"PRAGMA cache_size=-{settings.sqlite_cache_size_kib}",
+            "PRAGMA temp_store=MEMORY",
+        ]
+
+    if read_only:
+        # Соединения читателей не могут писать, даже если маршрут попробует
+        pragmas.append("PRAGMA query_only=ON")
+
+    return pragmas
+
+
+def install_sqlite_profile(
+    engine: Engine, settings: DatabaseSettings, read_only: bool = False
+) -> None:
+    pragmas = sqlite_pragmas(settings, read_only)
+
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+
+        for pragma in pragmas:
+            cursor.execute(pragma)
+
+        cursor.close()
+
+    event.listen(engine, "connect", set_pragmas)
+
+
+def install_explicit_begin(engine: Engine, mode: str = "IMMEDIATE") -> None:
+    """
+    Отключает неявный BEGIN драйвера sqlite3 и выдает BEGIN самостоятельно.
+
+    Без этого драйвер открывает транзакцию только перед первым DML, и
+    SAVEPOINT в начале транзакции становится внешней транзакцией, которую
+    RELEASE сразу фиксирует. BEGIN IMMEDIATE сразу берет блокировку записи.
+    """
+
+    def disable_driver_begin(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    def emit_begin(connection):
+        connection.exec_driver_sql(f"BEGIN {mode}")
+
+    event.listen(engine, "connect", disable_driver_begin)
+    event.listen(engine, "begin", emit_begin)
@@ -0,0 +1,160 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable, List, Optional, Tuple, TypeVar
+
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, AsyncSession
+
+from infrastructure.db.database import run_commit_hooks
+
+
+logger = logging.getLogger("task_tracker.write_pipeline")
+
+T = TypeVar("T")
+
+WriteOperation = Callable[[AsyncSession], Awaitable[T]]
+
+
+class WritePipeline:
+    """
+    Единственный писатель SQLite с групповым COMMIT.
+
+    Операции записи ставятся в очередь и выполняются по порядку на одном
+    долгоживущем соединении. Пачка из не более max_batch операций (или
+    все, что накопилось за max_delay_ms) идет в одной транзакции, каждая
+    операция — в своем SAVEPOINT. Ошибка одной операции откатывает
+    только ее, а остальные фиксируются общим COMMIT, то есть одним fsync.
+    Вызывающий код ждет результат своей операции, который приходит
+    только после COMMIT.
+    """
+
+    def __init__(
+        self, engine: AsyncEngine, max_batch: int = 64, max_delay_ms: float = 2
+    ) -> None:
+        if max_batch < 1:
+            raise ValueError("max_batch должен быть положительным")
+
+        self.engine = engine
+        self.max_batch = max_batch
+        self.max_delay = max_delay_ms / 1000
+        self.batches = 0
+        self.operations = 0
+        self._queue: "asyncio.Queue[Tuple[WriteOperation, asyncio.Future]]" = (
+            asyncio.Queue()
+        )
+        self._worker: Optional[asyncio.Task] = None
+
+    async def submit(self, operation: WriteOperation[T]) -> T:
+        """Выполняет операцию в очереди писателя и возвращает ее результат."""
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._run())
+
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((operation, future))
+
+        return await future
+
+    async def close(self) -> None:
+        if self._worker is not None:
+            self._worker.cancel()
+
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+
+            self._worker = None
+
+        await self.engine.dispose()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                async with self.engine.connect() as connection:
+                    while True:
+                        batch = await self._next_batch()
+                        await self._execute(connection, batch)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                # Соединение потеряно: операции пачки уже получили ошибку, переподключаемся
+                logger.exception("Писатель SQLite перезапускает соединение")
+
+    async def _next_batch(self) -> List[Tuple[WriteOperation, asyncio.Future]]:
+        batch = [await self._queue.get()]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.max_delay
+
+        while len(batch) < self.max_batch:
+            if not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                continue
+
+            timeout = deadline - loop.time()
+
+            if timeout <= 0:
+                break
+
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+
+        return batch
+
+    async def _execute(
+        self,
+        connection: AsyncConnection,
+        batch: List[Tuple[WriteOperation, asyncio.Future]],
+    ) -> None:
+        session = AsyncSession(bind=connection, expire_on_commit=False)
+        outcomes = []
+
+        try:
+            async with session.begin():
+                for operation, future in batch:
+                    if future.cancelled():
+                        continue
+
+                    hooks = session.info.setdefault("commit_hooks", [])
+                    hooks_before = len(hooks)
+
+                    try:
+                        async with session.begin_nested():
+                            result = await operation(session)
+                    except Exception as exc:
+                        # Действия после COMMIT от откаченной операции не нужны
+                        del hooks[hooks_before:]
+                        outcomes.append((future, exc, False))
+                    else:
+                        outcomes.append((future, result, True))
+        except Exception as exc:
+            session.info.pop("commit_hooks", None)
+
+            for future, value, succeeded in outcomes:
+                if not future.done():
+                    future.set_exception(exc if succeeded else value)
+
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+
+            raise
+        finally:
+            await session.close()
+
+        self.batches += 1
+        self.operations += len(outcomes)
+
+        try:
+            await run_commit_hooks(session)
+        except Exception:
+            logger.exception("Ошибка в действиях после COMMIT пачки записей")
+
+        for future, value, succeeded in outcomes:
+            if future.done():
+                continue
+
+            if succeeded:
+                future.set_result(value)
+            else:
+                future.set_exception(value)
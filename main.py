@@ -1,10 +1,51 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 
+from application.dependencies import (
+    build_task_archiver,
+    build_tracker_app,
+    reminder_scheduler,
+    write_pipeline,
+)
 from application.exception_handlers import CUSTOM_EXCEPTION_HANDLERS
+from infrastructure.db.query_log import QueryRouteMiddleware
 from user.api.router import user_router
 from task.api.router import task_router
 
 
-app = FastAPI(title="TaskTracker API", exception_handlers=CUSTOM_EXCEPTION_HANDLERS)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    app.state.tracker = build_tracker_app()
+    archiver = build_task_archiver(app.state.tracker)
+
+    if archiver is not None:
+        archiver.start()
+
+    if reminder_scheduler is not None:
+        reminder_scheduler.start()
+
+    yield
+
+    await app.state.tracker.purger.close()
+
+    if archiver is not None:
+        await archiver.close()
+
+    if reminder_scheduler is not None:
+        await reminder_scheduler.close()
+
+    if write_pipeline is not None:
+        await write_pipeline.close()
+
+
+app = FastAPI(
+    title="TaskTracker API",
+    exception_handlers=CUSTOM_EXCEPTION_HANDLERS,
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
+)
 app.include_router(user_router)
 app.include_router(task_router)
+app.add_middleware(QueryRouteMiddleware)
@@ -1,24 +1,49 @@
+from dataclasses import asdict
+from datetime import date
 from os import getenv
 from typing import List, Optional
 
 from dotenv import load_dotenv
-from fastapi import Depends, APIRouter, HTTPException
+from fastapi import Depends, APIRouter, Header, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
 from fastapi.security import APIKeyHeader
 
 from application.dependencies import get_app_instance, TaskTrackerApp, verify_bot_token
+from application.etag import etag_matches, make_etag, make_scope
+from application.responses import RawJSONResponse
+from application.route import SessionRoute
 from user.api.schema import DeleteResponse
-from task.api.schema import TaskCreateRequest, TaskResponse, TaskUpdateStatusRequest
+from task.api.schema import (
+    TaskBatchResponse,
+    TaskBatchUpdateStatusRequest,
+    TaskCreateRequest,
+    TaskResponse,
+    TaskUpdateStatusRequest,
+    dump_task,
+    dump_tasks,
+)
+from task.domain.model import SortDirection, TaskListQuery, TaskOrder
+from task.export import MEDIA_TYPES, ExportFormat, encode_export
 
 
 load_dotenv()
 
 task_router = APIRouter(
-    prefix="/task", tags=["tasks"], dependencies=[Depends(verify_bot_token)]
+    prefix="/task",
+    tags=["tasks"],
+    dependencies=[Depends(verify_bot_token)],
+    route_class=SessionRoute,
 )
 
 BOT_TOKEN = getenv("BOT_TOKEN")
 api_key_header = APIKeyHeader(name="Authorization", auto_error=False)
 
+MAX_PAGE_SIZE = 500
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+DEFAULT_SEARCH_LIMIT = 20
+MAX_SEARCH_LENGTH = 200
+
 
 @task_router.post("/", response_model=TaskResponse)
 async def create_task(
@@ -28,30 +53,196 @@ async def create_task(
 
     task = await tracker.tasks.create_task(request)
 
-    return task
+    return RawJSONResponse(dump_task(task))
+
+
+@task_router.post("/batch", response_model=List[TaskResponse])
+async def create_tasks(
+    requests: List[TaskCreateRequest],
+    tracker: TaskTrackerApp = Depends(get_app_instance),
+):
+    """Создать пачку задач одним запросом (например, импорт чек-листа)."""
+
+    tasks = await tracker.tasks.create_tasks(requests)
+
+    return RawJSONResponse(dump_tasks(tasks))
+
+
+@task_router.patch("/batch", response_model=TaskBatchResponse)
+async def update_tasks(
+    request: TaskBatchUpdateStatusRequest,
+    tracker: TaskTrackerApp = Depends(get_app_instance),
+):
+    """Изменить статус набора задач одним запросом."""
+
+    ids = await tracker.tasks.set_done_many(request.ids, request.done)
+
+    return TaskBatchResponse(ids=ids)
+
+
+@task_router.delete("/", response_model=TaskBatchResponse)
+async def clear_tasks(
+    user_id: int,
+    done: bool = True,
+    tracker: TaskTrackerApp = Depends(get_app_instance),
+):
+    """
+    Удалить задачи пользователя одним запросом.
+
+    По умолчанию (done=true) очищаются выполненные задачи, done=false
+    удаляет открытые. Удалить сразу все задачи этим запросом нельзя.
+    """
+
+    ids = await tracker.tasks.clear_tasks(user_id, done)
+
+    return TaskBatchResponse(ids=ids)
 
 
 @task_router.get("/", response_model=List[TaskResponse])
 async def list_tasks(
-    user_id: Optional[int] = None, tracker: TaskTrackerApp = Depends(get_app_instance)
+    user_id: Optional[int] = None,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    done: Optional[bool] = None,
+    order_by: TaskOrder = "id",
+    direction: SortDirection = "asc",
+    include_archived: bool = False,
+    if_none_match: Optional[str] = Header(None),
+    tracker: TaskTrackerApp = Depends(get_app_instance),
 ):
-    """Получить список задач пользователя (по user_id)."""
+    """
+    Получить список задач пользователя (по user_id).
+
+    Фильтр done, порядок order_by (id или due_date) и direction
+    выполняются в базе. Если задан limit, список отдается страницами:
+    курсор следующей страницы приходит в заголовке X-Next-Cursor и
+    передается обратно в параметре cursor вместе с теми же фильтрами.
+    Давно выполненные задачи из архива попадают в список только с
+    include_archived=true.
+
+    Ответ помечается ETag по версии списка пользователя (растет в базе
+    при каждой записи его задач) и параметрам страницы; на совпавший
+    If-None-Match возвращается 304 без чтения задач из базы.
+    """
 
     if user_id is None:
         raise HTTPException(status_code=400, detail="user_id обязателен")
 
-    tasks = await tracker.tasks.list_tasks(user_id)
+    query = TaskListQuery(
+        done=done,
+        order_by=order_by,
+        direction=direction,
+        include_archived=include_archived,
+    )
+
+    # Версию читаем до задач: при гонке с записью ETag окажется старым, а не ответ
+    version = await tracker.tasks.list_version(user_id)
+    headers = {}
+
+    if version is not None:
+        # Каждый фильтр, порядок и страница — свое представление со своим ETag
+        scope = make_scope(f"u{user_id}", limit=limit, cursor=cursor, **asdict(query))
+        etag = make_etag(scope, version)
+
+        if etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers={"ETag": etag})
+
+        headers["ETag"] = etag
+
+    page = await tracker.tasks.list_tasks(user_id, limit, cursor, query)
 
-    return tasks
+    if page.next_cursor:
+        headers[NEXT_CURSOR_HEADER] = page.next_cursor
+
+    return RawJSONResponse(dump_tasks(page.items), headers=headers)
+
+
+@task_router.get("/due", response_model=List[TaskResponse])
+async def list_due_tasks(
+    before: date,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    tracker: TaskTrackerApp = Depends(get_app_instance),
+):
+    """
+    Незакрытые задачи всех пользователей со сроком раньше before.
+
+    Задачи упорядочены по сроку; если задан limit, курсор следующей
+    страницы приходит в заголовке X-Next-Cursor.
+    """
+
+    page = await tracker.tasks.due_tasks(before, limit, cursor)
+    headers = {NEXT_CURSOR_HEADER: page.next_cursor} if page.next_cursor else {}
+
+    return RawJSONResponse(dump_tasks(page.items), headers=headers)
+
+
+@task_router.get("/search", response_model=List[TaskResponse])
+async def search_tasks(
+    user_id: int,
+    q: str = Query(..., min_length=1, max_length=MAX_SEARCH_LENGTH),
+    limit: int = Query(DEFAULT_SEARCH_LIMIT, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    tracker: TaskTrackerApp = Depends(get_app_instance),
+):
+    """
+    Полнотекстовый поиск по тексту задач пользователя.
+
+    Задачи упорядочены по релевантности; слова запроса ищутся как
+    префиксы. Курсор следующей страницы приходит в заголовке X-Next-Cursor.
+    """
+
+    page = await tracker.tasks.search_tasks(user_id, q, limit, cursor)
+    headers = {NEXT_CURSOR_HEADER: page.next_cursor} if page.next_cursor else {}
+
+    return RawJSONResponse(dump_tasks(page.items), headers=headers)
+
+
+@task_router.get("/export", response_class=StreamingResponse)
+async def export_tasks(
+    user_id: int,
+    export_format: ExportFormat = Query("ndjson", alias="format"),
+    tracker: TaskTrackerApp = Depends(get_app_instance),
+):
+    """Выгрузить все задачи пользователя потоком в NDJSON или CSV."""
+
+    rows = await tracker.tasks.export_tasks(user_id)
+
+    return StreamingResponse(
+        encode_export(rows, export_format),
+        media_type=MEDIA_TYPES[export_format],
+        headers={
+            "Content-Disposition": f'attachment; filename="tasks_{user_id}.{export_format}"'
+        },
+    )
 
 
 @task_router.get("/{task_id}", response_model=TaskResponse)
-async def get_task(task_id: int, tracker: TaskTrackerApp = Depends(get_app_instance)):
-    """Получить одну задачу по ID."""
+async def get_task(
+    task_id: int,
+    if_none_match: Optional[str] = Header(None),
+    tracker: TaskTrackerApp = Depends(get_app_instance),
+):
+    """
+    Получить одну задачу по ID (с поддержкой ETag / If-None-Match).
+
+    Версия задачи — версия списка ее владельца.
+    """
+
+    version = await tracker.tasks.task_version(task_id)
+    headers = {}
+
+    if version is not None:
+        etag = make_etag(f"t{task_id}", version)
+
+        if etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers={"ETag": etag})
+
+        headers["ETag"] = etag
 
     task = await tracker.tasks.get_task(task_id)
 
-    return task
+    return RawJSONResponse(dump_task(task), headers=headers)
 
 
 @task_router.patch("/{task_id}", response_model=TaskResponse)
@@ -67,7 +258,7 @@ async def update_task(
     else:
         task = await tracker.tasks.reopen(task_id)
 
-    return task
+    return RawJSONResponse(dump_task(task))
 
 
 @task_router.delete("/{task_id}", response_model=DeleteResponse)
@@ -1,7 +1,9 @@
-from typing import Optional
+from datetime import date
+from typing import Iterable, List, Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict, TypeAdapter
 
+from task.domain.model import Task
 from task.dto import TaskCreateRawData
 from user.domain.model import User
 
@@ -15,10 +17,37 @@ class TaskResponse(BaseModel):
     text: str
     done: bool
     creator: User
+    due_date: Optional[date] = None
 
-    class ConfigDict:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class TaskUpdateStatusRequest(BaseModel):
     done: bool
+
+
+class TaskBatchUpdateStatusRequest(BaseModel):
+    ids: List[int]
+    done: bool
+
+
+class TaskBatchResponse(BaseModel):
+    ids: List[int]
+
+
+# Сериализаторы собираются один раз при импорте. Доменные Task кодируются
+# в JSON напрямую, без промежуточных TaskResponse; в ответ попадают только
+# поля TaskResponse.
+TASK_RESPONSE_FIELDS = set(TaskResponse.model_fields)
+task_serializer = TypeAdapter(Task)
+task_list_serializer = TypeAdapter(List[Task])
+
+
+def dump_task(task: Task) -> bytes:
+    return task_serializer.dump_json(task, include=TASK_RESPONSE_FIELDS)
+
+
+def dump_tasks(tasks: Iterable[Task]) -> bytes:
+    return task_list_serializer.dump_json(
+        list(tasks), include={"__all__": TASK_RESPONSE_FIELDS}
+    )
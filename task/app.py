@@ -1,6 +1,8 @@
-from typing import List
+from datetime import date, datetime
+from typing import AsyncIterator, List, Optional
 
-from task.domain.model import Task
+from task.cursor import next_cursor, next_search_cursor
+from task.domain.model import Task, TaskCounts, TaskListQuery, TaskPage
 from task.dto import TaskCreateRawData
 from task.service import TaskService
 
@@ -14,17 +16,71 @@ class TaskApp:
     async def create_task(self, data: TaskCreateRawData) -> Task:
         return await self.task_service.create_task(data)
 
+    async def create_tasks(self, items: List[TaskCreateRawData]) -> List[Task]:
+        return await self.task_service.create_tasks(items)
+
     async def mark_done(self, task_id: int) -> Task:
         return await self.task_service.mark_done(task_id)
 
     async def reopen(self, task_id: int) -> Task:
         return await self.task_service.reopen(task_id)
 
-    async def list_tasks(self, user_id: int) -> List[Task]:
-        return await self.task_service.list_user_tasks(user_id)
+    async def set_done_many(self, task_ids: List[int], done: bool) -> List[int]:
+        return await self.task_service.set_done_many(task_ids, done)
+
+    async def list_tasks(
+        self,
+        user_id: int,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        query: Optional[TaskListQuery] = None,
+    ) -> TaskPage:
+        query = query or TaskListQuery()
+        tasks = await self.task_service.list_user_tasks(user_id, limit, cursor, query)
+
+        return TaskPage(
+            items=tasks, next_cursor=next_cursor(tasks, limit, query.order_by)
+        )
+
+    async def due_tasks(
+        self, before: date, limit: Optional[int] = None, cursor: Optional[str] = None
+    ) -> TaskPage:
+        tasks = await self.task_service.list_due_tasks(before, limit, cursor)
+
+        return TaskPage(items=tasks, next_cursor=next_cursor(tasks, limit, "due_date"))
+
+    async def search_tasks(
+        self, user_id: int, text: str, limit: int, cursor: Optional[str] = None
+    ) -> TaskPage:
+        hits = await self.task_service.search_user_tasks(user_id, text, limit, cursor)
+
+        return TaskPage(
+            items=[hit.task for hit in hits],
+            next_cursor=next_search_cursor(hits, limit),
+        )
+
+    async def user_counts(self, user_id: int) -> TaskCounts:
+        return await self.task_service.get_user_counts(user_id)
+
+    async def list_version(self, user_id: int) -> Optional[str]:
+        return await self.task_service.list_version(user_id)
+
+    async def task_version(self, task_id: int) -> Optional[str]:
+        return await self.task_service.task_version(task_id)
+
+    async def export_tasks(self, user_id: int) -> AsyncIterator[dict]:
+        return await self.task_service.export_user_tasks(user_id)
 
     async def get_task(self, task_id: int) -> Task:
         return await self.task_service.get_task(task_id)
 
     async def delete_task(self, task_id: int) -> bool:
         return await self.task_service.delete_task(task_id)
+
+    async def clear_tasks(
+        self, user_id: int, done: Optional[bool] = None, limit: Optional[int] = None
+    ) -> List[int]:
+        return await self.task_service.clear_user_tasks(user_id, done, limit)
+
+    async def archive_done(self, before: datetime, limit: int) -> List[int]:
+        return await self.task_service.archive_done_tasks(before, limit)
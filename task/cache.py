@@ -0,0 +1,63 @@
+from datetime import date
+from json import dumps, loads
+from typing import Iterable, Optional
+
+from infrastructure.cache import CacheBackend
+from task.domain.model import Task, User
+
+
+class TaskCache:
+    """
+    Кэш задач по ID поверх подключаемого CacheBackend.
+
+    Задачи хранятся в JSON, чтобы тот же формат подходил и для
+    внешнего хранилища вроде Redis, а вызывающий код всегда получал
+    собственную копию доменной модели.
+
+    Сброс после COMMIT не исключает гонку: чтение, начатое до COMMIT,
+    может вернуть в кэш старую строку, и она проживет до ttl.
+
+    Версии для ETag хранятся не здесь, а в базе (user_task_counts.version),
+    чтобы их видели все процессы приложения.
+    """
+
+    def __init__(self, backend: CacheBackend, ttl: Optional[float] = None) -> None:
+        self.backend = backend
+        self.ttl = ttl
+
+    @staticmethod
+    def _key(task_id: int) -> str:
+        return f"task:{task_id}"
+
+    async def get(self, task_id: int) -> Optional[Task]:
+        raw = await self.backend.get(self._key(task_id))
+
+        if raw is None:
+            return None
+
+        data = loads(raw)
+
+        return Task(
+            id=data["id"],
+            text=data["text"],
+            done=data["done"],
+            due_date=date.fromisoformat(data["due_date"]) if data["due_date"] else None,
+            creator=User(**data["creator"]),
+        )
+
+    async def set(self, task: Task) -> None:
+        data = {
+            "id": task.id,
+            "text": task.text,
+            "done": task.done,
+            "due_date": task.due_date.isoformat() if task.due_date else None,
+            "creator": {"id": task.creator.id, "telegram_id": task.creator.telegram_id},
+        }
+        await self.backend.set(self._key(task.id), dumps(data), self.ttl)
+
+    async def invalidate(self, task_ids: Iterable[int]) -> None:
+        """Сбрасывает задачи из кэша."""
+        keys = [self._key(task_id) for task_id in task_ids]
+
+        if keys:
+            await self.backend.delete(*keys)
@@ -0,0 +1,88 @@
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import date
+from json import dumps, loads
+from typing import List, Optional, Tuple
+
+from task.domain.model import Task, TaskOrder, TaskSearchHit
+
+
+def encode_cursor(data: dict) -> str:
+    """Упаковывает позицию keyset-пагинации в непрозрачную строку."""
+    raw = dumps(data, separators=(",", ":")).encode()
+
+    return urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> dict:
+    """Распаковывает курсор, полученный от клиента."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = loads(urlsafe_b64decode(padded.encode()))
+    except ValueError:
+        raise ValueError("Некорректный курсор")
+
+    # bool — подкласс int, поэтому {"id": true} отсекается проверкой типа
+    if not isinstance(data, dict) or type(data.get("id")) is not int:
+        raise ValueError("Некорректный курсор")
+
+    return data
+
+
+def cursor_position(cursor: str, order_by: TaskOrder) -> Tuple[int, Optional[date]]:
+    """
+    Позиция (id, due_date) последней задачи страницы из курсора.
+
+    Курсор списка по сроку хранит и срок (None — задача без срока);
+    курсор от другого порядка сортировки не принимается.
+    """
+    data = decode_cursor(cursor)
+
+    if order_by != "due_date":
+        return data["id"], None
+
+    if "due_date" not in data:
+        raise ValueError("Некорректный курсор")
+
+    try:
+        due_date = date.fromisoformat(data["due_date"]) if data["due_date"] else None
+    except (TypeError, ValueError):
+        raise ValueError("Некорректный курсор")
+
+    return data["id"], due_date
+
+
+def next_cursor(
+    tasks: List[Task], limit: Optional[int], order_by: TaskOrder = "id"
+) -> Optional[str]:
+    """Курсор следующей страницы, если текущая заполнена целиком."""
+    if limit is None or len(tasks) < limit:
+        return None
+
+    last = tasks[-1]
+    data: dict = {"id": last.id}
+
+    if order_by == "due_date":
+        data["due_date"] = last.due_date.isoformat() if last.due_date else None
+
+    return encode_cursor(data)
+
+
+def search_position(cursor: str) -> Tuple[float, int]:
+    """Позиция (rank, id) последней находки страницы поиска из курсора."""
+    data = decode_cursor(cursor)
+    rank = data.get("rank")
+
+    if isinstance(rank, bool) or not isinstance(rank, (int, float)):
+        raise ValueError("Некорректный курсор")
+
+    return float(rank), data["id"]
+
+
+def next_search_cursor(hits: List[TaskSearchHit], limit: int) -> Optional[str]:
+    """Курсор следующей страницы поиска, если текущая заполнена целиком."""
+    if len(hits) < limit:
+        return None
+
+    last = hits[-1]
+
+    return encode_cursor({"id": last.task.id, "rank": last.rank})
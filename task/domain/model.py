@@ -1,11 +1,11 @@
 from dataclasses import dataclass
 from datetime import date
-from typing import Optional
+from typing import List, Literal, Optional
 
 from user.domain.model import User
 
 
-@dataclass
+@dataclass(slots=True)
 class Task:
     id: Optional[int]
     text: str
@@ -18,3 +18,44 @@ class Task:
 
     def reopen(self):
         self.done = False
+
+
+TaskOrder = Literal["id", "due_date"]
+SortDirection = Literal["asc", "desc"]
+
+
+@dataclass(slots=True)
+class TaskListQuery:
+    """Фильтр и порядок списка задач пользователя."""
+
+    done: Optional[bool] = None
+    order_by: TaskOrder = "id"
+    direction: SortDirection = "asc"
+    # Читать и архив выполненных задач (tasks_archive)
+    include_archived: bool = False
+
+
+@dataclass(slots=True)
+class TaskCounts:
+    """Число открытых и выполненных задач пользователя."""
+
+    open: int = 0
+    done: int = 0
+
+    @property
+    def total(self) -> int:
+        return self.open + self.done
+
+
+@dataclass(slots=True)
+class TaskSearchHit:
+    """Найденная задача и ее ранг (меньше — релевантнее)."""
+
+    task: Task
+    rank: float
+
+
+@dataclass(slots=True)
+class TaskPage:
+    items: List[Task]
+    next_cursor: Optional[str] = None
@@ -1,14 +1,58 @@
-from typing import List, Protocol
+from datetime import date, datetime
+from typing import AsyncIterator, List, Optional, Protocol, Tuple
 
-from task.domain.model import Task, User
+from task.domain.model import Task, TaskCounts, TaskListQuery, TaskSearchHit, User
 
 
 class TaskRepository(Protocol):
 
     async def save(self, task: Task) -> Task: ...
 
+    async def save_many(self, tasks: List[Task]) -> List[Task]: ...
+
+    async def set_done(self, task_id: int, done: bool) -> Task: ...
+
+    async def set_done_many(self, task_ids: List[int], done: bool) -> List[int]: ...
+
     async def get_by_id(self, task_id: int) -> Task: ...
 
-    async def list_by_user(self, user: User) -> List[Task]: ...
+    async def list_by_user(
+        self,
+        user: User,
+        limit: Optional[int] = None,
+        after_id: Optional[int] = None,
+        query: Optional[TaskListQuery] = None,
+        after_due_date: Optional[date] = None,
+    ) -> List[Task]: ...
+
+    async def list_due(
+        self,
+        before: Optional[date] = None,
+        limit: Optional[int] = None,
+        after_id: Optional[int] = None,
+        after_due_date: Optional[date] = None,
+    ) -> List[Task]: ...
+
+    async def search_by_user(
+        self,
+        user: User,
+        text: str,
+        limit: Optional[int] = None,
+        after: Optional[Tuple[float, int]] = None,
+    ) -> List[TaskSearchHit]: ...
+
+    async def counts_by_user(self, user_id: int) -> Optional[TaskCounts]: ...
+
+    async def list_version(self, user_id: int) -> Optional[str]: ...
+
+    async def task_version(self, task_id: int) -> Optional[str]: ...
+
+    def stream_by_user(self, user: User) -> AsyncIterator[dict]: ...
 
     async def delete_task(self, id: int) -> bool: ...
+
+    async def delete_by_user(
+        self, user_id: int, done: Optional[bool] = None, limit: Optional[int] = None
+    ) -> List[int]: ...
+
+    async def archive_done(self, before: datetime, limit: int) -> List[int]: ...
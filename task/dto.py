@@ -1,3 +1,4 @@
+from datetime import date
 from pydantic import BaseModel, model_validator
 
 from typing import Optional
@@ -12,6 +13,7 @@ class TaskCreateRawData(BaseModel):
     user_id: Optional[int] = None
     telegram_id: Optional[int] = None
     text: str
+    due_date: Optional[date] = None
 
     @model_validator(mode="after")
     def check_user_or_telegram(self):
@@ -0,0 +1,45 @@
+from csv import DictWriter
+from io import StringIO
+from json import dumps
+from typing import AsyncIterator, Dict, Literal
+
+ExportFormat = Literal["ndjson", "csv"]
+
+EXPORT_FIELDS = ("id", "text", "done", "user_id", "due_date")
+
+MEDIA_TYPES: Dict[str, str] = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+
+async def ndjson_lines(rows: AsyncIterator[dict]) -> AsyncIterator[str]:
+    """Кодирует строки выгрузки в NDJSON по одной записи за раз."""
+    async for row in rows:
+        # default=str кодирует due_date в ISO 8601, как и CSV
+        yield dumps(row, ensure_ascii=False, default=str) + "\n"
+
+
+async def csv_lines(rows: AsyncIterator[dict]) -> AsyncIterator[str]:
+    """Кодирует строки выгрузки в CSV, переиспользуя один буфер."""
+    buffer = StringIO()
+    writer = DictWriter(buffer, fieldnames=EXPORT_FIELDS)
+    writer.writeheader()
+
+    async for row in rows:
+        writer.writerow(row)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def encode_export(
+    rows: AsyncIterator[dict], export_format: ExportFormat
+) -> AsyncIterator[str]:
+    if export_format == "csv":
+        return csv_lines(rows)
+
+    return ndjson_lines(rows)
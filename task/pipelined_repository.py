@@ -0,0 +1,109 @@
+from datetime import date, datetime
+from typing import AsyncIterator, Callable, List, Optional, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from infrastructure.db.write_pipeline import WritePipeline
+from task.domain.model import Task, TaskCounts, TaskListQuery, TaskSearchHit, User
+from task.domain.repository import TaskRepository
+
+
+class PipelinedTaskRepository(TaskRepository):
+    """
+    Обертка над TaskRepository, отправляющая записи в WritePipeline.
+
+    Чтение идет через репозиторий сессии запроса, а каждая запись
+    выполняется репозиторием, собранным make_repo на сессии писателя.
+    """
+
+    def __init__(
+        self,
+        inner: TaskRepository,
+        pipeline: WritePipeline,
+        make_repo: Callable[[AsyncSession], TaskRepository],
+    ):
+        self.inner = inner
+        self.pipeline = pipeline
+        self.make_repo = make_repo
+
+    async def save(self, task: Task) -> Task:
+        return await self.pipeline.submit(lambda s: self.make_repo(s).save(task))
+
+    async def save_many(self, tasks: List[Task]) -> List[Task]:
+        return await self.pipeline.submit(lambda s: self.make_repo(s).save_many(tasks))
+
+    async def set_done(self, task_id: int, done: bool) -> Task:
+        return await self.pipeline.submit(
+            lambda s: self.make_repo(s).set_done(task_id, done)
+        )
+
+    async def set_done_many(self, task_ids: List[int], done: bool) -> List[int]:
+        return await self.pipeline.submit(
+            lambda s: self.make_repo(s).set_done_many(task_ids, done)
+        )
+
+    async def get_by_id(self, task_id: int) -> Task:
+        return await self.inner.get_by_id(task_id)
+
+    async def list_by_user(
+        self,
+        user: User,
+        limit: Optional[int] = None,
+        after_id: Optional[int] = None,
+        query: Optional[TaskListQuery] = None,
+        after_due_date: Optional[date] = None,
+    ) -> List[Task]:
+        return await self.inner.list_by_user(
+            user,
+            limit=limit,
+            after_id=after_id,
+            query=query,
+            after_due_date=after_due_date,
+        )
+
+    async def list_due(
+        self,
+        before: Optional[date] = None,
+        limit: Optional[int] = None,
+        after_id: Optional[int] = None,
+        after_due_date: Optional[date] = None,
+    ) -> List[Task]:
+        return await self.inner.list_due(
+            before, limit=limit, after_id=after_id, after_due_date=after_due_date
+        )
+
+    async def search_by_user(
+        self,
+        user: User,
+        text: str,
+        limit: Optional[int] = None,
+        after: Optional[Tuple[float, int]] = None,
+    ) -> List[TaskSearchHit]:
+        return await self.inner.search_by_user(user, text, limit=limit, after=after)
+
+    async def counts_by_user(self, user_id: int) -> Optional[TaskCounts]:
+        return await self.inner.counts_by_user(user_id)
+
+    async def list_version(self, user_id: int) -> Optional[str]:
+        return await self.inner.list_version(user_id)
+
+    async def task_version(self, task_id: int) -> Optional[str]:
+        return await self.inner.task_version(task_id)
+
+    def stream_by_user(self, user: User) -> AsyncIterator[dict]:
+        return self.inner.stream_by_user(user)
+
+    async def delete_task(self, id: int) -> bool:
+        return await self.pipeline.submit(lambda s: self.make_repo(s).delete_task(id))
+
+    async def delete_by_user(
+        self, user_id: int, done: Optional[bool] = None, limit: Optional[int] = None
+    ) -> List[int]:
+        return await self.pipeline.submit(
+            lambda s: self.make_repo(s).delete_by_user(user_id, done, limit)
+        )
+
+    async def archive_done(self, before: datetime, limit: int) -> List[int]:
+        return await self.pipeline.submit(
+            lambda s: self.make_repo(s).archive_done(before, limit)
+        )
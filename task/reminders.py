@@ -0,0 +1,221 @@
+import asyncio
+import heapq
+import logging
+from datetime import date, datetime, time, timedelta, timezone
+from typing import AsyncContextManager, Callable, Iterable, List, Optional, Tuple
+
+import httpx
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from task.domain.model import Task
+from task.domain.repository import TaskRepository
+
+
+logger = logging.getLogger("task_tracker.reminders")
+
+# Позиция задачи в порядке напоминаний: (срок, id)
+Position = Tuple[date, int]
+
+
+def utc_today() -> date:
+    return datetime.now(timezone.utc).date()
+
+
+def deadline_of(due_date: date) -> float:
+    """Момент напоминания (UNIX time): начало дня срока по UTC."""
+    return datetime.combine(due_date, time.min, tzinfo=timezone.utc).timestamp()
+
+
+class ReminderScheduler:
+    """
+    Фоновая рассылка напоминаний о сроках задач.
+
+    В памяти держится куча только из heap_size ближайших сроков; она
+    нужна лишь для того, чтобы знать, когда проснуться. В момент срока
+    незакрытые задачи, чей срок наступил, читаются из базы диапазоном по
+    индексу (done, due_date, id) и отправляются на вебхук пачками по
+    batch_size. Позиция последней отправленной задачи хранится в памяти,
+    поэтому после перезапуска рассылка продолжается с задач со сроком
+    не раньше since (по умолчанию — сегодня).
+
+    Новые задачи приходят через notify после COMMIT; задачи, созданные
+    другими процессами, подхватываются не позже чем через max_sleep_s.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncContextManager[AsyncSession]],
+        make_repo: Callable[[AsyncSession], TaskRepository],
+        webhook_url: str,
+        batch_size: int = 100,
+        heap_size: int = 1000,
+        max_sleep_s: float = 3600,
+        retry_delay_s: float = 30,
+        client: Optional[httpx.AsyncClient] = None,
+        since: Optional[date] = None,
+    ) -> None:
+        if batch_size < 1 or heap_size < 1:
+            raise ValueError("batch_size и heap_size должны быть положительными")
+
+        self.session_factory = session_factory
+        self.make_repo = make_repo
+        self.webhook_url = webhook_url
+        self.batch_size = batch_size
+        self.heap_size = heap_size
+        self.max_sleep = max_sleep_s
+        self.retry_delay = retry_delay_s
+        self.client = client or httpx.AsyncClient(timeout=10)
+        self._owns_client = client is None
+        # Строго после (since, 0) — то же, что срок не раньше since
+        self.position: Position = (since or utc_today(), 0)
+        self.batches = 0
+        self.sent = 0
+        self._heap: List[Position] = []
+        # Последняя загруженная в кучу позиция; None — загружено все
+        self._horizon: Optional[Position] = self.position
+        self._wakeup = asyncio.Event()
+        self._worker: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._run())
+
+    async def close(self) -> None:
+        if self._worker is not None:
+            self._worker.cancel()
+
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+
+            self._worker = None
+
+        if self._owns_client:
+            await self.client.aclose()
+
+    async def notify(self, tasks: Iterable[Task]) -> None:
+        """Добавляет сроки новых задач в кучу и будит планировщик."""
+        for task in tasks:
+            if task.due_date is None or task.done:
+                continue
+
+            position = (task.due_date, task.id)
+
+            # Задачи дальше загруженного окна прочитает следующая догрузка
+            if position > self.position and (
+                self._horizon is None or position <= self._horizon
+            ):
+                heapq.heappush(self._heap, position)
+                self._wakeup.set()
+
+    async def dispatch_due(self) -> int:
+        """
+        Отправляет все незакрытые задачи, срок которых наступил.
+
+        Позиция сдвигается только после успешной отправки пачки, так что
+        при ошибке вебхука пачка уйдет повторно. Возвращает число задач.
+        """
+        before = utc_today() + timedelta(days=1)
+        sent = 0
+
+        while True:
+            due_date, task_id = self.position
+
+            async with self.session_factory() as session:
+                tasks = await self.make_repo(session).list_due(
+                    before,
+                    limit=self.batch_size,
+                    after_id=task_id,
+                    after_due_date=due_date,
+                )
+
+            if not tasks:
+                break
+
+            await self._send(tasks)
+            self.position = (tasks[-1].due_date, tasks[-1].id)
+            self.batches += 1
+            sent += len(tasks)
+
+            if len(tasks) < self.batch_size:
+                break
+
+        self.sent += sent
+
+        # Наступившие сроки покрыты чтением из базы, в том числе уже закрытые задачи
+        while self._heap and self._heap[0][0] < before:
+            heapq.heappop(self._heap)
+
+        return sent
+
+    async def _send(self, tasks: List[Task]) -> None:
+        payload = {
+            "reminders": [
+                {
+                    "task_id": task.id,
+                    "user_id": task.creator.id,
+                    "telegram_id": task.creator.telegram_id,
+                    "text": task.text,
+                    "due_date": task.due_date.isoformat(),
+                }
+                for task in tasks
+            ]
+        }
+        response = await self.client.post(self.webhook_url, json=payload)
+        response.raise_for_status()
+
+    async def _refill(self) -> None:
+        """Загружает в кучу ближайшие heap_size сроков после текущей позиции."""
+        due_date, task_id = self.position
+
+        async with self.session_factory() as session:
+            tasks = await self.make_repo(session).list_due(
+                limit=self.heap_size, after_id=task_id, after_due_date=due_date
+            )
+
+        # Список уже упорядочен по (срок, id) и потому сразу является кучей
+        self._heap = [(task.due_date, task.id) for task in tasks]
+        full = len(tasks) == self.heap_size
+        self._horizon = self._heap[-1] if full else None
+
+    async def _sleep(self, timeout: float) -> bool:
+        """Ждет notify не дольше timeout секунд; True, если разбудили."""
+        self._wakeup.clear()
+
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+
+        return True
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                if not self._heap:
+                    await self._refill()
+
+                delay = None
+
+                if self._heap:
+                    now = datetime.now(timezone.utc).timestamp()
+                    delay = deadline_of(self._heap[0][0]) - now
+
+                if delay is not None and delay <= 0:
+                    await self.dispatch_due()
+                    continue
+
+                timeout = (
+                    self.max_sleep if delay is None else min(delay, self.max_sleep)
+                )
+                woken = await self._sleep(timeout)
+
+                # Окно могло устареть: задачи со сроком добавляют и другие процессы
+                if not woken and (delay is None or delay > self.max_sleep):
+                    self._heap.clear()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Ошибка рассылки напоминаний, повтор через паузу")
+                await asyncio.sleep(self.retry_delay)
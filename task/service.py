@@ -1,9 +1,16 @@
-from typing import List
+from datetime import date, datetime
+from typing import AsyncIterator, List, Optional
 
 from task.domain.repository import Task, User, TaskRepository
 from user.domain.repository import UserRepository
+from task.cursor import cursor_position, search_position
+from task.domain.model import TaskCounts, TaskListQuery, TaskSearchHit
 from task.dto import TaskCreateRawData
-from exceptions import TaskNotFoundError, UserNotFoundError
+from exceptions import UserNotFoundError
+
+
+# Максимальное число задач в одном пакетном запросе
+MAX_BATCH_SIZE = 500
 
 
 class TaskService:
@@ -13,41 +20,139 @@ class TaskService:
 
     async def create_task(self, data: TaskCreateRawData) -> Task:
         if data.user_id:
-            user_id = data.user_id
+            user: User = await self.user_repo.get_user(data.user_id)
 
-        elif data.telegram_id:
-            user_id = await self.user_repo.get_user_by_telegram_id(data.telegram_id)
+        else:
+            user = await self.user_repo.get_by_telegram_id(data.telegram_id)
 
-        user: User = await self.user_repo.get_user(user_id)
-        task = Task(id=None, text=data.text, creator=user)
+        task = Task(id=None, text=data.text, creator=user, due_date=data.due_date)
 
         return await self.task_repo.save(task)
 
-    async def mark_done(self, task_id: int) -> Task:
-        task = await self.task_repo.get_by_id(task_id)
-        task.mark_done()
-        await self.task_repo.save(task)
+    async def create_tasks(self, items: List[TaskCreateRawData]) -> List[Task]:
+        """
+        Создает пачку задач.
+
+        Каждый user_id и telegram_id разрешается один раз на всю пачку,
+        а сами задачи вставляются одним запросом.
+        """
+        if len(items) > MAX_BATCH_SIZE:
+            raise ValueError(f"Не больше {MAX_BATCH_SIZE} задач за раз")
+
+        user_ids = {item.user_id for item in items if item.user_id}
+        telegram_ids = {item.telegram_id for item in items if not item.user_id}
+
+        users = await self.user_repo.get_users(user_ids) if user_ids else {}
+        users_by_telegram = (
+            await self.user_repo.get_users_by_telegram_ids(telegram_ids)
+            if telegram_ids
+            else {}
+        )
+
+        if len(users) < len(user_ids):
+            raise UserNotFoundError("Пользователь не найден")
+
+        if len(users_by_telegram) < len(telegram_ids):
+            raise UserNotFoundError("Пользователь по telegram_id не найден")
+
+        tasks = [
+            Task(
+                id=None,
+                text=item.text,
+                due_date=item.due_date,
+                creator=(
+                    users[item.user_id]
+                    if item.user_id
+                    else users_by_telegram[item.telegram_id]
+                ),
+            )
+            for item in items
+        ]
+
+        return await self.task_repo.save_many(tasks)
 
-        return task
+    async def mark_done(self, task_id: int) -> Task:
+        return await self.task_repo.set_done(task_id, True)
 
     async def reopen(self, task_id: int) -> Task:
-        task = await self.task_repo.get_by_id(task_id)
+        return await self.task_repo.set_done(task_id, False)
 
-        if not task:
-            raise TaskNotFoundError("Задача не найдена")
+    async def set_done_many(self, task_ids: List[int], done: bool) -> List[int]:
+        if len(task_ids) > MAX_BATCH_SIZE:
+            raise ValueError(f"Не больше {MAX_BATCH_SIZE} задач за раз")
 
-        task.reopen()
-        await self.task_repo.save(task)
+        if not task_ids:
+            return []
 
-        return task
+        return await self.task_repo.set_done_many(task_ids, done)
 
-    async def list_user_tasks(self, user_id: int) -> List[Task]:
+    async def list_user_tasks(
+        self,
+        user_id: int,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        query: Optional[TaskListQuery] = None,
+    ) -> List[Task]:
         user = await self.user_repo.get_user(user_id)
 
         if not user:
             raise UserNotFoundError("Пользователь не найден")
 
-        return await self.task_repo.list_by_user(user)
+        query = query or TaskListQuery()
+        after_id, after_due_date = (
+            cursor_position(cursor, query.order_by) if cursor else (None, None)
+        )
+
+        return await self.task_repo.list_by_user(
+            user,
+            limit=limit,
+            after_id=after_id,
+            query=query,
+            after_due_date=after_due_date,
+        )
+
+    async def list_due_tasks(
+        self, before: date, limit: Optional[int] = None, cursor: Optional[str] = None
+    ) -> List[Task]:
+        after_id, after_due_date = (
+            cursor_position(cursor, "due_date") if cursor else (None, None)
+        )
+
+        return await self.task_repo.list_due(
+            before, limit=limit, after_id=after_id, after_due_date=after_due_date
+        )
+
+    async def search_user_tasks(
+        self, user_id: int, text: str, limit: int, cursor: Optional[str] = None
+    ) -> List[TaskSearchHit]:
+        user = await self.user_repo.get_user(user_id)
+
+        if not user:
+            raise UserNotFoundError("Пользователь не найден")
+
+        after = search_position(cursor) if cursor else None
+
+        return await self.task_repo.search_by_user(user, text, limit=limit, after=after)
+
+    async def get_user_counts(self, user_id: int) -> TaskCounts:
+        counts = await self.task_repo.counts_by_user(user_id)
+
+        if counts is None:
+            raise UserNotFoundError("Пользователь не найден")
+
+        return counts
+
+    async def list_version(self, user_id: int) -> Optional[str]:
+        return await self.task_repo.list_version(user_id)
+
+    async def task_version(self, task_id: int) -> Optional[str]:
+        return await self.task_repo.task_version(task_id)
+
+    async def export_user_tasks(self, user_id: int) -> AsyncIterator[dict]:
+        """Проверяет пользователя и возвращает поток его задач для выгрузки."""
+        user = await self.user_repo.get_user(user_id)
+
+        return self.task_repo.stream_by_user(user)
 
     async def get_task(self, task_id: int) -> Task:
         return await self.task_repo.get_by_id(task_id)
@@ -55,5 +160,13 @@ class TaskService:
     async def delete_task(self, id: int) -> bool:
         return await self.task_repo.delete_task(id)
 
+    async def clear_user_tasks(
+        self, user_id: int, done: Optional[bool] = None, limit: Optional[int] = None
+    ) -> List[int]:
+        return await self.task_repo.delete_by_user(user_id, done, limit)
+
+    async def archive_done_tasks(self, before: datetime, limit: int) -> List[int]:
+        return await self.task_repo.archive_done(before, limit)
+
     async def get_user_by_telegram_id(self, telegram_id: int) -> int:
         return await self.user_repo.get_user_by_telegram_id(telegram_id)
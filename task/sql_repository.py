@@ -1,19 +1,154 @@
-from typing import List, Optional
+from collections import deque
+from datetime import date, datetime, timezone
+from typing import AsyncIterator, Deque, Dict, Iterable, List, Optional, Tuple
 
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import (
+    ColumnElement,
+    Date,
+    Float,
+    FromClause,
+    Row,
+    Select,
+    delete,
+    false,
+    func,
+    insert,
+    literal,
+    literal_column,
+    select,
+    true,
+    tuple_,
+    union_all,
+    update,
+)
 from sqlalchemy.orm import joinedload
 
 from exceptions import TaskNotFoundError, UserNotFoundError
-from task.domain.model import Task, User
+from task.domain.model import Task, TaskCounts, TaskListQuery, TaskSearchHit, User
 from task.domain.repository import TaskRepository
-from infrastructure.db.models import DBTask
+from infrastructure.db.database import mark_written, on_commit
+from infrastructure.db.models import DBTask, DBTaskArchive, DBUser, DBUserTaskCounts
+from infrastructure.db.search import SEARCH_CONFIG, SEARCH_VECTOR, fts5_query, tasks_fts
+from task.cache import TaskCache
+from task.reminders import ReminderScheduler
+
+
+# Сколько строк драйвер отдает за одну выборку при потоковой выгрузке
+EXPORT_BATCH_SIZE = 1000
+
+# Колонки, общие для tasks и tasks_archive в списках задач
+LIST_COLUMNS = ("id", "text", "done", "due_date", "user_id")
+
+
+def utc_now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def done_at_value(done: bool):
+    """Новое значение done_at: момент первого выполнения или NULL."""
+    return func.coalesce(DBTask.done_at, utc_now()) if done else None
 
 
 class SQLAlchemyTaskRepository(TaskRepository):
 
-    def __init__(self, session: AsyncSession):
+    def __init__(
+        self,
+        session: AsyncSession,
+        cache: Optional[TaskCache] = None,
+        reminders: Optional[ReminderScheduler] = None,
+    ):
         self.session = session
+        self.cache = cache
+        self.reminders = reminders
+
+    def _invalidate(self, task_ids: List[int], user_ids: Iterable[int]) -> None:
+        """Сбрасывает измененные задачи из кэша после COMMIT транзакции."""
+        mark_written(self.session, users=set(user_ids), tasks=task_ids)
+
+        if self.cache is not None and task_ids:
+            cache = self.cache
+            on_commit(self.session, lambda: cache.invalidate(task_ids))
+
+    async def _add_counts(
+        self, changes: Iterable[Tuple[int, bool, int]], touched: Iterable[int] = ()
+    ) -> None:
+        """
+        Применяет изменения задач к счетчикам их владельцев и увеличивает
+        версии их списков одним INSERT ... ON CONFLICT DO UPDATE.
+
+        changes — тройки (user_id, done, delta): delta=1 для созданной
+        задачи, -1 для удаленной; смена статуса — две такие тройки.
+        touched — владельцы задач, у которых изменилось что-то кроме
+        статуса: счетчики у них прежние, а версия списка растет.
+        """
+        counts: Dict[int, List[int]] = {user_id: [0, 0] for user_id in touched}
+
+        for user_id, done, delta in changes:
+            counts.setdefault(user_id, [0, 0])[bool(done)] += delta
+
+        if not counts:
+            return
+
+        dialect = self.session.get_bind().dialect.name
+        upsert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+        stmt = upsert(DBUserTaskCounts).values(
+            [
+                {
+                    "user_id": user_id,
+                    "open_count": open_count,
+                    "done_count": done_count,
+                    "version": 1,
+                }
+                for user_id, (open_count, done_count) in counts.items()
+            ]
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[DBUserTaskCounts.user_id],
+            set_={
+                "open_count": DBUserTaskCounts.open_count + stmt.excluded.open_count,
+                "done_count": DBUserTaskCounts.done_count + stmt.excluded.done_count,
+                "version": DBUserTaskCounts.version + 1,
+            },
+        )
+        await self.session.execute(stmt)
+
+    async def _change_done(
+        self, condition: ColumnElement[bool], done: bool, *columns: ColumnElement
+    ) -> List[Row]:
+        """
+        Меняет статус задач, у которых он действительно другой, одним
+        UPDATE ... RETURNING и переносит их между счетчиками.
+
+        UPDATE блокирует строки задач: параллельная смена статуса той же
+        задачи ждет COMMIT, перепроверяет done <> :done и строку уже не
+        меняет, поэтому счетчики сдвигаются ровно один раз. Возвращает
+        строки измененных задач (user_id и columns).
+        """
+        stmt = (
+            update(DBTask)
+            .where(condition, DBTask.done != done)
+            .values(done=done, done_at=done_at_value(done))
+            .returning(DBTask.user_id, *columns)
+        )
+        result = await self.session.execute(stmt)
+        rows = result.all()
+        await self._add_counts(
+            change
+            for row in rows
+            for change in ((row.user_id, not done, -1), (row.user_id, done, 1))
+        )
+
+        return rows
+
+    def _schedule(self, tasks: List[Task]) -> None:
+        """Передает сроки новых задач планировщику напоминаний после COMMIT."""
+        due = [task for task in tasks if task.due_date is not None]
+
+        if self.reminders is not None and due:
+            reminders = self.reminders
+            on_commit(self.session, lambda: reminders.notify(due))
 
     def _db_to_domain_task(self, db_task: DBTask) -> Task:
         """Хелпер-транслятор для задачи."""
@@ -26,38 +161,181 @@ class SQLAlchemyTaskRepository(TaskRepository):
         )
 
         return Task(
-            id=db_task.id, text=db_task.text, done=db_task.done, creator=domain_user
+            id=db_task.id,
+            text=db_task.text,
+            done=db_task.done,
+            due_date=db_task.due_date,
+            creator=domain_user,
         )
 
     async def save(self, task: Task) -> Task:
-        """Сохраняет или обновляет задачу."""
+        """
+        Сохраняет или обновляет задачу одним запросом.
+
+        Создатель задачи уже есть в памяти, поэтому после записи
+        возвращается та же доменная модель без повторного SELECT.
+        """
         if task.id is None:
-            db_task = DBTask(text=task.text, done=task.done, user_id=task.creator.id)
-            self.session.add(db_task)
-            await self.session.flush()
-            await self.session.refresh(db_task)
-            task.id = db_task.id  # Обновляем доменную модель новым ID
+            stmt = (
+                insert(DBTask)
+                .values(
+                    text=task.text,
+                    done=task.done,
+                    due_date=task.due_date,
+                    done_at=utc_now() if task.done else None,
+                    user_id=task.creator.id,
+                )
+                .returning(DBTask.id)
+            )
+            result = await self.session.execute(stmt)
+            task.id = result.scalar_one()  # Обновляем доменную модель новым ID
+            await self._add_counts([(task.creator.id, task.done, 1)])
+            self._invalidate([task.id], [task.creator.id])
+            self._schedule([task])
+
+            return task
 
+        # Обновление существующей задачи: UPDATE полей блокирует строку и
+        # возвращает прежний статус, статус меняется отдельно со счетчиками
+        stmt = (
+            update(DBTask)
+            .where(DBTask.id == task.id)
+            .values(text=task.text, due_date=task.due_date)
+            .returning(DBTask.user_id, DBTask.done)
+        )
+        result = await self.session.execute(stmt)
+        row = result.one_or_none()
+
+        if row is None:
+            raise TaskNotFoundError("Задача не найдена")
+
+        if row.done != task.done:
+            await self._change_done(DBTask.id == task.id, task.done)
         else:
-            # Обновление существующей задачи (изменение текста/статуса)
-            db_task = await self.session.get(DBTask, task.id)
-            if db_task:
-                db_task.text = task.text
-                db_task.done = task.done
+            await self._add_counts([], touched=[row.user_id])
 
-        # Получаем полную доменную модель, чтобы вернуть актуальный объект
-        response = await self.get_by_id(task.id)
+        self._invalidate([task.id], [task.creator.id])
 
-        if response:
+        return task
 
-            return response
+    async def save_many(self, tasks: List[Task]) -> List[Task]:
+        """
+        Создает пачку новых задач одним многострочным INSERT ... RETURNING.
 
-        raise TaskNotFoundError
+        Порядок строк RETURNING не гарантирован, поэтому ID сопоставляются
+        с задачами по вставленным значениям; одинаковые задачи
+        взаимозаменяемы, и какая из них получит какой ID, неважно.
+        Создатели берутся из уже загруженных User.
+        """
+        if not tasks:
+            return tasks
+
+        now = utc_now()
+        stmt = (
+            insert(DBTask)
+            .values(
+                [
+                    {
+                        "text": task.text,
+                        "done": task.done,
+                        "due_date": task.due_date,
+                        "done_at": now if task.done else None,
+                        "user_id": task.creator.id,
+                    }
+                    for task in tasks
+                ]
+            )
+            .returning(
+                DBTask.id, DBTask.text, DBTask.done, DBTask.due_date, DBTask.user_id
+            )
+        )
+        result = await self.session.execute(stmt)
+        ids: Dict[Tuple, Deque[int]] = {}
+
+        for task_id, *values in result:
+            ids.setdefault(tuple(values), deque()).append(task_id)
+
+        for task in tasks:
+            key = (task.text, task.done, task.due_date, task.creator.id)
+            task.id = ids[key].popleft()
+
+        await self._add_counts((task.creator.id, task.done, 1) for task in tasks)
+
+        self._invalidate(
+            [task.id for task in tasks], [task.creator.id for task in tasks]
+        )
+        self._schedule(tasks)
+
+        return tasks
+
+    async def set_done(self, task_id: int, done: bool) -> Task:
+        """
+        Меняет статус задачи одним UPDATE ... RETURNING.
+
+        telegram_id создателя читается подзапросом в том же RETURNING,
+        чтобы не делать отдельный SELECT с JOIN. Если статус уже такой,
+        задача просто читается (и 404, если ее нет).
+        """
+        creator_telegram_id = (
+            select(DBUser.telegram_id)
+            .where(DBUser.id == DBTask.user_id)
+            .scalar_subquery()
+        )
+        rows = await self._change_done(
+            DBTask.id == task_id,
+            done,
+            DBTask.id,
+            DBTask.text,
+            DBTask.done,
+            DBTask.due_date,
+            creator_telegram_id.label("telegram_id"),
+        )
+
+        if not rows:
+            return await self.get_by_id(task_id)
+
+        row = rows[0]
+        self._invalidate([row.id], [row.user_id])
+
+        return Task(
+            id=row.id,
+            text=row.text,
+            done=row.done,
+            due_date=row.due_date,
+            creator=User(id=row.user_id, telegram_id=row.telegram_id),
+        )
+
+    async def set_done_many(self, task_ids: List[int], done: bool) -> List[int]:
+        """
+        Меняет статус набора задач одним UPDATE, возвращает ID найденных.
+
+        Задачи, у которых статус уже такой, не меняются; их наличие
+        проверяется отдельным SELECT только если такие есть.
+        """
+        rows = await self._change_done(DBTask.id.in_(task_ids), done, DBTask.id)
+        updated_ids = [row.id for row in rows]
+        self._invalidate(updated_ids, [row.user_id for row in rows])
+        unchanged = set(task_ids) - set(updated_ids)
+
+        if not unchanged:
+            return updated_ids
+
+        result = await self.session.execute(
+            select(DBTask.id).where(DBTask.id.in_(unchanged))
+        )
+
+        return updated_ids + list(result.scalars())
 
     async def get_by_id(
         self, task_id: int
     ) -> Optional[Task]:  # Изменен тип возврата на Optional
-        """Получает задачу по ID."""
+        """Получает задачу по ID, сначала заглядывая в кэш (если он подключен)."""
+        if self.cache is not None:
+            cached = await self.cache.get(task_id)
+
+            if cached is not None:
+                return cached
+
         # Загружаем DBTask вместе с создателем
         stmt = (
             select(DBTask)
@@ -68,34 +346,423 @@ class SQLAlchemyTaskRepository(TaskRepository):
         db_task = result.scalars().first()
 
         if db_task:
+            task = self._db_to_domain_task(db_task)
+
+            if self.cache is not None:
+                await self.cache.set(task)
 
-            return self._db_to_domain_task(db_task)
+            return task
 
         raise TaskNotFoundError
 
-    async def list_by_user(self, user: User) -> List[Task]:
-        """Получает список задач для конкретного пользователя."""
+    async def list_by_user(
+        self,
+        user: User,
+        limit: Optional[int] = None,
+        after_id: Optional[int] = None,
+        query: Optional[TaskListQuery] = None,
+        after_due_date: Optional[date] = None,
+    ) -> List[Task]:
+        """Получает список задач для конкретного пользователя.
+
+        Фильтр done и порядок (по id или сроку, в обе стороны) задает query.
+        Пагинация keyset: следующая страница начинается строго после
+        позиции (after_due_date, after_id) последней задачи, без OFFSET.
+
+        Выбираются только нужные колонки кортежами, без ORM-сущностей и
+        JOIN с users: создатель у всех задач один и уже известен (user).
+        Архив читается только при query.include_archived.
+        """
+        query = query or TaskListQuery()
+        descending = query.direction == "desc"
+        rows = self._list_source(query.include_archived)
+        stmt = select(rows.c.id, rows.c.text, rows.c.done, rows.c.due_date).where(
+            rows.c.user_id == user.id
+        )
+
+        if query.done is not None:
+            stmt = stmt.where(rows.c.done == query.done)
+
+        if query.order_by == "due_date":
+            return await self._list_by_due_date(
+                rows, stmt, user, limit, after_id, after_due_date, descending
+            )
+
+        if after_id is not None:
+            stmt = stmt.where(
+                rows.c.id < after_id if descending else rows.c.id > after_id
+            )
+
+        return await self._fetch_tasks(
+            stmt.order_by(rows.c.id.desc() if descending else rows.c.id), user, limit
+        )
+
+    def _list_source(self, include_archived: bool) -> FromClause:
+        """
+        Таблица, из которой читается список: горячая tasks или UNION ALL
+        tasks и tasks_archive (фильтры по user_id база переносит внутрь
+        обеих частей, и каждая читается своим индексом).
+        """
+        if not include_archived:
+            return DBTask.__table__
+
+        return union_all(
+            select(*(DBTask.__table__.c[name] for name in LIST_COLUMNS)),
+            select(*(DBTaskArchive.__table__.c[name] for name in LIST_COLUMNS)),
+        ).subquery("all_tasks")
+
+    async def _list_by_due_date(
+        self,
+        rows: FromClause,
+        stmt: Select,
+        user: User,
+        limit: Optional[int],
+        after_id: Optional[int],
+        after_due_date: Optional[date],
+        descending: bool,
+    ) -> List[Task]:
+        """
+        Список по сроку: сначала задачи со сроком, затем без срока.
+
+        Каждая часть читается своим диапазоном по (user_id, due_date, id);
+        условие с OR по NULL-срокам индекс так использовать не дает.
+        """
+        tasks: List[Task] = []
+        on_dated_part = after_id is None or after_due_date is not None
+
+        if on_dated_part:
+            dated = stmt.where(rows.c.due_date.is_not(None))
+
+            if after_id is not None:
+                position = tuple_(rows.c.due_date, rows.c.id)
+                cursor = tuple_(literal(after_due_date, Date), literal(after_id))
+                dated = dated.where(
+                    position < cursor if descending else position > cursor
+                )
+
+            if descending:
+                dated = dated.order_by(rows.c.due_date.desc(), rows.c.id.desc())
+            else:
+                dated = dated.order_by(rows.c.due_date, rows.c.id)
+
+            tasks = await self._fetch_tasks(dated, user, limit)
+
+            if limit is not None and len(tasks) == limit:
+                return tasks
+
+        undated = stmt.where(rows.c.due_date.is_(None))
+
+        if not on_dated_part:
+            undated = undated.where(
+                rows.c.id < after_id if descending else rows.c.id > after_id
+            )
+
+        undated = undated.order_by(rows.c.id.desc() if descending else rows.c.id)
+        remaining = None if limit is None else limit - len(tasks)
+
+        return tasks + await self._fetch_tasks(undated, user, remaining)
+
+    async def _fetch_tasks(
+        self, stmt: Select, user: User, limit: Optional[int]
+    ) -> List[Task]:
+        if limit is not None:
+            stmt = stmt.limit(limit)
+
+        result = await self.session.execute(stmt)
+
+        return [
+            Task(id=id, text=text, done=done, due_date=due_date, creator=user)
+            for id, text, done, due_date in result
+        ]
+
+    async def list_due(
+        self,
+        before: Optional[date] = None,
+        limit: Optional[int] = None,
+        after_id: Optional[int] = None,
+        after_due_date: Optional[date] = None,
+    ) -> List[Task]:
+        """
+        Незакрытые задачи всех пользователей со сроком раньше before.
+
+        Порядок (due_date, id) и keyset после (after_due_date, after_id)
+        дают один диапазон по индексу (done, due_date, id). Без before —
+        все предстоящие задачи.
+        """
         stmt = (
-            select(DBTask)
-            .where(DBTask.user_id == user.id)
-            .options(
-                joinedload(DBTask.creator)
-            )  # JOIN для получения данных о создателе
+            select(
+                DBTask.id,
+                DBTask.text,
+                DBTask.due_date,
+                DBUser.id.label("user_id"),
+                DBUser.telegram_id,
+            )
+            .join(DBTask.creator)
+            .where(DBTask.done == false(), DBTask.due_date.is_not(None))
         )
 
+        if before is not None:
+            stmt = stmt.where(DBTask.due_date < before)
+
+        if after_id is not None:
+            stmt = stmt.where(
+                tuple_(DBTask.due_date, DBTask.id)
+                > tuple_(literal(after_due_date, Date), literal(after_id))
+            )
+
+        stmt = stmt.order_by(DBTask.due_date, DBTask.id)
+
+        if limit is not None:
+            stmt = stmt.limit(limit)
+
         result = await self.session.execute(stmt)
-        db_tasks = result.scalars().all()
 
-        return [self._db_to_domain_task(db_task) for db_task in db_tasks]
+        return [
+            Task(
+                id=row.id,
+                text=row.text,
+                due_date=row.due_date,
+                creator=User(id=row.user_id, telegram_id=row.telegram_id),
+            )
+            for row in result
+        ]
+
+    async def search_by_user(
+        self,
+        user: User,
+        text: str,
+        limit: Optional[int] = None,
+        after: Optional[Tuple[float, int]] = None,
+    ) -> List[TaskSearchHit]:
+        """
+        Полнотекстовый поиск по задачам пользователя.
+
+        SQLite ищет по FTS5-таблице (ранг bm25), PostgreSQL — по GIN-индексу
+        колонки tsvector (ранг -ts_rank). Результаты упорядочены по
+        (rank, id); пагинация keyset после позиции after = (rank, id).
+        """
+        columns = (DBTask.id, DBTask.text, DBTask.done, DBTask.due_date)
+
+        if self.session.get_bind().dialect.name == "postgresql":
+            ts_query = func.plainto_tsquery(SEARCH_CONFIG, text)
+            search_vector = literal_column(f"{DBTask.__tablename__}.{SEARCH_VECTOR}")
+            rank = -func.ts_rank(search_vector, ts_query)
+            stmt = select(*columns, rank).where(search_vector.op("@@")(ts_query))
+        else:
+            match = fts5_query(text)
+
+            if match is None:
+                return []
+
+            rank = tasks_fts.c.rank
+            stmt = (
+                select(*columns, rank)
+                .join_from(tasks_fts, DBTask, DBTask.id == tasks_fts.c.rowid)
+                .where(literal_column(tasks_fts.name).op("MATCH")(match))
+            )
+
+        stmt = stmt.where(DBTask.user_id == user.id)
+
+        if after is not None:
+            stmt = stmt.where(
+                tuple_(rank, DBTask.id)
+                > tuple_(literal(after[0], Float), literal(after[1]))
+            )
+
+        stmt = stmt.order_by(rank, DBTask.id)
+
+        if limit is not None:
+            stmt = stmt.limit(limit)
+
+        result = await self.session.execute(stmt)
+
+        return [
+            TaskSearchHit(
+                task=Task(id=id, text=text, done=done, due_date=due_date, creator=user),
+                rank=rank,
+            )
+            for id, text, done, due_date, rank in result
+        ]
+
+    async def counts_by_user(self, user_id: int) -> Optional[TaskCounts]:
+        """
+        Счетчики задач пользователя одним чтением по первичному ключу.
+
+        None — пользователя нет; у пользователя без задач счетчики нулевые.
+        """
+        stmt = (
+            select(DBUserTaskCounts.open_count, DBUserTaskCounts.done_count)
+            .select_from(DBUser)
+            .outerjoin(DBUserTaskCounts, DBUserTaskCounts.user_id == DBUser.id)
+            .where(DBUser.id == user_id)
+        )
+        result = await self.session.execute(stmt)
+        row = result.one_or_none()
+
+        if row is None:
+            return None
+
+        return TaskCounts(open=row.open_count or 0, done=row.done_count or 0)
+
+    async def list_version(self, user_id: int) -> Optional[str]:
+        """
+        Версия списка задач пользователя для ETag одним чтением по
+        первичному ключу user_task_counts.
+
+        None — у пользователя еще не было задач (или его нет).
+        """
+        stmt = select(DBUserTaskCounts.version).where(
+            DBUserTaskCounts.user_id == user_id
+        )
+        result = await self.session.execute(stmt)
+        version = result.scalar_one_or_none()
+
+        return None if version is None else str(version)
+
+    async def task_version(self, task_id: int) -> Optional[str]:
+        """
+        Версия задачи для ETag — версия списка ее владельца.
+
+        Меняется и при изменении других задач пользователя, зато
+        читается двумя поисками по первичным ключам. None — задачи нет.
+        """
+        stmt = (
+            select(DBUserTaskCounts.version)
+            .join(DBTask, DBTask.user_id == DBUserTaskCounts.user_id)
+            .where(DBTask.id == task_id)
+        )
+        result = await self.session.execute(stmt)
+        version = result.scalar_one_or_none()
+
+        return None if version is None else str(version)
+
+    async def stream_by_user(self, user: User) -> AsyncIterator[dict]:
+        """
+        Потоково отдает задачи пользователя, включая архив, в виде словарей.
+
+        Строки читаются серверным курсором пачками по EXPORT_BATCH_SIZE,
+        без ORM-сущностей и без сборки полного списка в памяти.
+        """
+        rows = self._list_source(include_archived=True)
+        stmt = (
+            select(rows.c.id, rows.c.text, rows.c.done, rows.c.user_id, rows.c.due_date)
+            .where(rows.c.user_id == user.id)
+            .order_by(rows.c.id)
+            .execution_options(yield_per=EXPORT_BATCH_SIZE)
+        )
+
+        result = await self.session.stream(stmt)
+
+        async for row in result.mappings():
+            yield dict(row)
 
     async def delete_task(self, id: int) -> bool:
-        """Удаляет задачу по ID."""
-        db_task = await self.session.get(DBTask, id)
+        """
+        Удаляет задачу по ID одним DELETE ... RETURNING.
 
-        if db_task:
-            await self.session.delete(db_task)
-            await self.session.flush()
+        Если в tasks задачи нет, она удаляется из архива вторым DELETE.
+        """
+        for table in (DBTask, DBTaskArchive):
+            stmt = (
+                delete(table).where(table.id == id).returning(table.user_id, table.done)
+            )
+            result = await self.session.execute(stmt)
+            row = result.one_or_none()
+
+            if row is not None:
+                break
+        else:
+            raise TaskNotFoundError
 
-            return True
+        await self._add_counts([(row.user_id, row.done, -1)])
+        self._invalidate([id], [row.user_id])
 
-        raise TaskNotFoundError
+        return True
+
+    async def delete_by_user(
+        self, user_id: int, done: Optional[bool] = None, limit: Optional[int] = None
+    ) -> List[int]:
+        """
+        Удаляет задачи пользователя из tasks и архива, возвращает ID удаленных.
+
+        По одному DELETE на таблицу; в архиве только выполненные задачи,
+        поэтому при done=false он не трогается. Если done задан, удаляются
+        только задачи с этим статусом. limit ограничивает пачку первыми по
+        id задачами (фоновая очистка): архив чистится, когда в tasks
+        подходящих задач не осталось.
+        """
+        tables = (DBTask,) if done is False else (DBTask, DBTaskArchive)
+        rows: List[Row] = []
+
+        for table in tables:
+            remaining = None if limit is None else limit - len(rows)
+
+            if remaining == 0:
+                break
+
+            condition = table.user_id == user_id
+
+            if done is not None:
+                condition = condition & (table.done == done)
+
+            if remaining is not None:
+                batch = (
+                    select(table.id)
+                    .where(condition)
+                    .order_by(table.id)
+                    .limit(remaining)
+                )
+                condition = table.id.in_(batch)
+
+            stmt = delete(table).where(condition).returning(table.id, table.done)
+            result = await self.session.execute(stmt)
+            rows += result.all()
+
+        task_ids = [row.id for row in rows]
+        await self._add_counts((user_id, row.done, -1) for row in rows)
+        self._invalidate(task_ids, [user_id])
+
+        return task_ids
+
+    async def archive_done(self, before: datetime, limit: int) -> List[int]:
+        """
+        Переносит в tasks_archive пачку до limit задач, выполненных раньше before.
+
+        DELETE ... RETURNING забирает строки из tasks (диапазон по индексу
+        (done, done_at); триггер убирает их и из полнотекстового индекса),
+        а INSERT кладет те же строки в архив — в одной транзакции. Счетчики
+        не меняются: архивные задачи остаются выполненными задачами
+        пользователя; растут только версии списков владельцев. Возвращает
+        ID перенесенных задач.
+        """
+        batch = (
+            select(DBTask.id)
+            .where(DBTask.done == true(), DBTask.done_at < before)
+            .order_by(DBTask.done_at)
+            .limit(limit)
+        )
+        stmt = (
+            delete(DBTask)
+            .where(DBTask.id.in_(batch))
+            .returning(
+                DBTask.id,
+                DBTask.text,
+                DBTask.done,
+                DBTask.user_id,
+                DBTask.due_date,
+                DBTask.done_at,
+            )
+        )
+        result = await self.session.execute(stmt)
+        rows = [row._asdict() for row in result]
+
+        if not rows:
+            return []
+
+        await self.session.execute(insert(DBTaskArchive), rows)
+        task_ids = [row["id"] for row in rows]
+        user_ids = {row["user_id"] for row in rows}
+        await self._add_counts([], touched=user_ids)
+        self._invalidate(task_ids, user_ids)
+
+        return task_ids
@@ -3,6 +3,8 @@ from sys import path as syspath
 
 syspath.insert(0, path.abspath(path.join(path.dirname(__file__), "..")))
 
+import json
+from datetime import date, datetime, timedelta, timezone
 from typing import AsyncGenerator
 
 from dotenv import load_dotenv
@@ -10,12 +12,23 @@ import httpx
 from httpx import ASGITransport
 import pytest
 import pytest_asyncio
+from sqlalchemy import event, text
+from sqlalchemy.exc import OperationalError
 from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.requests import Request
 
-from main import app
+from main import app, lifespan
+from application import route
 from application.dependencies import get_app_instance, TaskTrackerApp
-from infrastructure.db.database import engine
-from user.sql_repository import SQLAlchemyUserRepository
+from infrastructure.cache import InMemoryCacheBackend, LRUCache
+from infrastructure.db import database
+from infrastructure.db.database import engine, run_commit_hooks
+from infrastructure.db.routing import RecentWrites
+from infrastructure.db.query_log import SlowQueryLog
+from task.api.schema import TaskResponse, dump_tasks
+from task.cache import TaskCache
+from task.domain.model import Task
+from user.sql_repository import SQLAlchemyUserRepository, User
 from task.sql_repository import SQLAlchemyTaskRepository
 from user.service import UserService
 from task.service import TaskService
@@ -157,6 +170,20 @@ class TestUserRouter:
         assert response.status_code == 400
         assert "уже зарегестрирован" in response.json()["detail"]
 
+    async def test_put_user_by_telegram_is_idempotent(
+        self, client: httpx.AsyncClient, bot_auth_header: dict
+    ):
+        """Проверка get-or-create по telegram_id: 201 при создании, затем 200."""
+        created = await client.put("/user/by-telegram/1002", headers=bot_auth_header)
+
+        assert created.status_code == 201
+        assert created.json()["telegram_id"] == 1002
+
+        existing = await client.put("/user/by-telegram/1002", headers=bot_auth_header)
+
+        assert existing.status_code == 200
+        assert existing.json() == created.json()
+
     async def test_delete_user_success(
         self,
         client: httpx.AsyncClient,
@@ -336,3 +363,686 @@ class TestTaskRouter:
         # Проверяем, что задача не найдена после удаления
         response = await client.get(f"/task/{task_id}", headers=bot_auth_header)
         assert response.status_code == 404
+
+    async def test_list_tasks_paginated(
+        self,
+        client: httpx.AsyncClient,
+        bot_auth_header: dict,
+        registered_user_data: dict,
+    ):
+        """Проверка постраничного получения списка задач по курсору."""
+        user_id = registered_user_data["id"]
+
+        for i in range(3):
+            await client.post(
+                "/task/",
+                json={"user_id": user_id, "text": f"Задача {i}"},
+                headers=bot_auth_header,
+            )
+
+        first = await client.get(
+            f"/task/?user_id={user_id}&limit=2", headers=bot_auth_header
+        )
+        assert first.status_code == 200
+        assert [t["text"] for t in first.json()] == ["Задача 0", "Задача 1"]
+        cursor = first.headers["X-Next-Cursor"]
+
+        second = await client.get(
+            f"/task/?user_id={user_id}&limit=2&cursor={cursor}",
+            headers=bot_auth_header,
+        )
+        assert [t["text"] for t in second.json()] == ["Задача 2"]
+        assert "X-Next-Cursor" not in second.headers
+
+    async def test_list_tasks_invalid_cursor_raises_400(
+        self,
+        client: httpx.AsyncClient,
+        bot_auth_header: dict,
+        registered_user_data: dict,
+    ):
+        """Проверка, что испорченный курсор возвращает 400."""
+        # "eyJpZCI6dHJ1ZX0" — {"id": true}: bool не принимается за ID
+        for cursor in ("!!!", "eyJpZCI6dHJ1ZX0"):
+            response = await client.get(
+                f"/task/?user_id={registered_user_data['id']}&limit=2&cursor={cursor}",
+                headers=bot_auth_header,
+            )
+            assert response.status_code == 400
+
+    async def test_list_tasks_filtered_and_sorted(
+        self,
+        client: httpx.AsyncClient,
+        bot_auth_header: dict,
+        registered_user_data: dict,
+    ):
+        """Проверка фильтра done и сортировки списка на стороне базы."""
+        user_id = registered_user_data["id"]
+        created = await client.post(
+            "/task/batch",
+            json=[{"user_id": user_id, "text": f"Задача {i}"} for i in range(4)],
+            headers=bot_auth_header,
+        )
+        ids = [t["id"] for t in created.json()]
+        await client.patch(
+            "/task/batch", json={"ids": ids[:2], "done": True}, headers=bot_auth_header
+        )
+
+        done = await client.get(
+            f"/task/?user_id={user_id}&done=true&direction=desc",
+            headers=bot_auth_header,
+        )
+        assert [t["id"] for t in done.json()] == [ids[1], ids[0]]
+
+        first = await client.get(
+            f"/task/?user_id={user_id}&limit=2", headers=bot_auth_header
+        )
+        by_due_date = await client.get(
+            f"/task/?user_id={user_id}&limit=2&order_by=due_date"
+            f"&cursor={first.headers['X-Next-Cursor']}",
+            headers=bot_auth_header,
+        )
+        assert by_due_date.status_code == 400
+
+        unknown = await client.get(
+            f"/task/?user_id={user_id}&order_by=text", headers=bot_auth_header
+        )
+        assert unknown.status_code == 422
+
+    async def test_delete_user_with_tasks(
+        self,
+        client: httpx.AsyncClient,
+        bot_auth_header: dict,
+        registered_user_data: dict,
+        created_task: dict,
+    ):
+        """Проверка удаления пользователя с задачами, сразу и в фоне."""
+        user_id = registered_user_data["id"]
+
+        response = await client.delete(f"/user/{user_id}", headers=bot_auth_header)
+        assert response.status_code == 200
+        assert response.json() == {"success": True}
+
+        task = await client.get(f"/task/{created_task['id']}", headers=bot_auth_header)
+        assert task.status_code == 404
+
+        other = await client.post(
+            "/user/", json={"telegram_id": 99998}, headers=bot_auth_header
+        )
+        other_id = other.json()["id"]
+        await client.post(
+            "/task/batch",
+            json=[{"user_id": other_id, "text": f"Задача {i}"} for i in range(3)],
+            headers=bot_auth_header,
+        )
+
+        response = await client.delete(
+            f"/user/{other_id}?background=true", headers=bot_auth_header
+        )
+        assert response.status_code == 202
+        await app.dependency_overrides[get_app_instance]().purger.drain()
+
+        stats = await client.get(f"/user/{other_id}/stats", headers=bot_auth_header)
+        assert stats.status_code == 404
+
+        missing = await client.delete(
+            "/user/999999?background=true", headers=bot_auth_header
+        )
+        assert missing.status_code == 404
+
+    async def test_list_tasks_include_archived(
+        self,
+        client: httpx.AsyncClient,
+        bot_auth_header: dict,
+        registered_user_data: dict,
+    ):
+        """Проверка списка задач с архивом выполненных задач и без него."""
+        user_id = registered_user_data["id"]
+        created = await client.post(
+            "/task/batch",
+            json=[{"user_id": user_id, "text": f"Задача {i}"} for i in range(3)],
+            headers=bot_auth_header,
+        )
+        ids = [t["id"] for t in created.json()]
+        await client.patch(
+            "/task/batch", json={"ids": ids[:2], "done": True}, headers=bot_auth_header
+        )
+
+        tracker = app.dependency_overrides[get_app_instance]()
+        before = datetime.now(timezone.utc) + timedelta(seconds=1)
+        assert await tracker.tasks.archive_done(before, 100) == ids[:2]
+
+        hot = await client.get(f"/task/?user_id={user_id}", headers=bot_auth_header)
+        assert [t["id"] for t in hot.json()] == ids[2:]
+
+        everything = await client.get(
+            f"/task/?user_id={user_id}&include_archived=true", headers=bot_auth_header
+        )
+        assert everything.status_code == 200
+        assert [t["id"] for t in everything.json()] == ids
+        assert all(t["done"] for t in everything.json()[:2])
+
+    async def test_user_stats(
+        self,
+        client: httpx.AsyncClient,
+        bot_auth_header: dict,
+        registered_user_data: dict,
+    ):
+        """Проверка счетчиков задач пользователя."""
+        user_id = registered_user_data["id"]
+        created = await client.post(
+            "/task/batch",
+            json=[{"user_id": user_id, "text": f"Задача {i}"} for i in range(3)],
+            headers=bot_auth_header,
+        )
+        ids = [t["id"] for t in created.json()]
+        await client.patch(
+            f"/task/{ids[0]}", json={"done": True}, headers=bot_auth_header
+        )
+        await client.delete(f"/task/{ids[1]}", headers=bot_auth_header)
+
+        response = await client.get(f"/user/{user_id}/stats", headers=bot_auth_header)
+
+        assert response.status_code == 200
+        assert response.json() == {"total": 2, "open": 1, "done": 1}
+
+        missing = await client.get("/user/999999/stats", headers=bot_auth_header)
+        assert missing.status_code == 404
+
+    async def test_list_due_tasks(
+        self,
+        client: httpx.AsyncClient,
+        bot_auth_header: dict,
+        registered_user_data: dict,
+    ):
+        """Проверка срока в создании задачи и выборки задач со сроком до даты."""
+        user_id = registered_user_data["id"]
+        created = await client.post(
+            "/task/batch",
+            json=[
+                {"user_id": user_id, "text": "Позже", "due_date": "2031-05-03"},
+                {"user_id": user_id, "text": "Раньше", "due_date": "2031-05-01"},
+                {"user_id": user_id, "text": "Еще раньше", "due_date": "2031-05-01"},
+                {"user_id": user_id, "text": "Без срока"},
+            ],
+            headers=bot_auth_header,
+        )
+        ids = [t["id"] for t in created.json()]
+        assert created.json()[0]["due_date"] == "2031-05-03"
+
+        first = await client.get(
+            "/task/due?before=2031-05-03&limit=1", headers=bot_auth_header
+        )
+        second = await client.get(
+            f"/task/due?before=2031-05-03&limit=1&cursor={first.headers['X-Next-Cursor']}",
+            headers=bot_auth_header,
+        )
+        due = first.json() + second.json()
+        assert [t["id"] for t in due if t["due_date"] >= "2031-05-01"] == ids[1:3]
+
+        invalid = await client.get("/task/due?before=soon", headers=bot_auth_header)
+        assert invalid.status_code == 422
+
+    async def test_search_tasks(
+        self,
+        client: httpx.AsyncClient,
+        bot_auth_header: dict,
+        registered_user_data: dict,
+    ):
+        """Проверка полнотекстового поиска с пагинацией по курсору."""
+        user_id = registered_user_data["id"]
+        created = await client.post(
+            "/task/batch",
+            json=[
+                {"user_id": user_id, "text": text}
+                for text in ("Купить хлеб", "Хлеб и хлебцы", "Вынести мусор")
+            ],
+            headers=bot_auth_header,
+        )
+        ids = [t["id"] for t in created.json()]
+
+        first = await client.get(
+            f"/task/search?user_id={user_id}&q=хлеб&limit=1", headers=bot_auth_header
+        )
+        assert first.status_code == 200
+        assert [t["id"] for t in first.json()] == [ids[1]]
+
+        second = await client.get(
+            f"/task/search?user_id={user_id}&q=хлеб&limit=1"
+            f"&cursor={first.headers['X-Next-Cursor']}",
+            headers=bot_auth_header,
+        )
+        assert [t["id"] for t in second.json()] == [ids[0]]
+
+        missing = await client.get(
+            "/task/search?user_id=999999&q=хлеб", headers=bot_auth_header
+        )
+        assert missing.status_code == 404
+
+        empty = await client.get(
+            f"/task/search?user_id={user_id}&q=", headers=bot_auth_header
+        )
+        assert empty.status_code == 422
+
+    async def test_export_tasks_ndjson_and_csv(
+        self,
+        client: httpx.AsyncClient,
+        bot_auth_header: dict,
+        registered_user_data: dict,
+        created_task: dict,
+    ):
+        """Проверка потоковой выгрузки задач в NDJSON и CSV."""
+        user_id = registered_user_data["id"]
+
+        response = await client.get(
+            f"/task/export?user_id={user_id}", headers=bot_auth_header
+        )
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        rows = [json.loads(line) for line in response.text.splitlines()]
+        assert rows == [
+            {
+                "id": created_task["id"],
+                "text": "Задача для изменения",
+                "done": False,
+                "user_id": user_id,
+                "due_date": None,
+            }
+        ]
+
+        response = await client.get(
+            f"/task/export?user_id={user_id}&format=csv", headers=bot_auth_header
+        )
+        assert response.status_code == 200
+        lines = response.text.splitlines()
+        assert lines[0] == "id,text,done,user_id,due_date"
+        assert lines[1] == f"{created_task['id']},Задача для изменения,False,{user_id},"
+
+        dated = await client.post(
+            "/task/",
+            json={"user_id": user_id, "text": "Со сроком", "due_date": "2030-01-02"},
+            headers=bot_auth_header,
+        )
+        response = await client.get(
+            f"/task/export?user_id={user_id}", headers=bot_auth_header
+        )
+        last = json.loads(response.text.splitlines()[-1])
+        assert last["id"] == dated.json()["id"]
+        assert last["due_date"] == "2030-01-02"
+
+    async def test_export_tasks_unknown_user_raises_404(
+        self, client: httpx.AsyncClient, bot_auth_header: dict
+    ):
+        """Проверка, что выгрузка для несуществующего пользователя возвращает 404."""
+        response = await client.get(
+            "/task/export?user_id=999999", headers=bot_auth_header
+        )
+        assert response.status_code == 404
+
+    async def test_post_tasks_batch_success(
+        self,
+        client: httpx.AsyncClient,
+        bot_auth_header: dict,
+        registered_user_data: dict,
+    ):
+        """Проверка пакетного создания задач по user_id и telegram_id."""
+        response = await client.post(
+            "/task/batch",
+            json=[
+                {"telegram_id": registered_user_data["telegram_id"], "text": "Хлеб"},
+                {"user_id": registered_user_data["id"], "text": "Молоко"},
+                {"telegram_id": registered_user_data["telegram_id"], "text": "Сыр"},
+            ],
+            headers=bot_auth_header,
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert [t["text"] for t in data] == ["Хлеб", "Молоко", "Сыр"]
+        assert all(t["creator"]["id"] == registered_user_data["id"] for t in data)
+        assert data[0]["id"] < data[1]["id"] < data[2]["id"]
+
+    async def test_post_tasks_batch_unknown_user_raises_404(
+        self, client: httpx.AsyncClient, bot_auth_header: dict
+    ):
+        """Проверка, что пачка с несуществующим пользователем возвращает 404."""
+        response = await client.post(
+            "/task/batch",
+            json=[{"telegram_id": 999999, "text": "Задача в никуда"}],
+            headers=bot_auth_header,
+        )
+        assert response.status_code == 404
+
+    async def test_patch_tasks_batch_and_clear_completed(
+        self,
+        client: httpx.AsyncClient,
+        bot_auth_header: dict,
+        registered_user_data: dict,
+    ):
+        """Проверка пакетной смены статуса и очистки выполненных задач."""
+        user_id = registered_user_data["id"]
+        created = await client.post(
+            "/task/batch",
+            json=[{"user_id": user_id, "text": f"Пункт {i}"} for i in range(3)],
+            headers=bot_auth_header,
+        )
+        ids = [t["id"] for t in created.json()]
+
+        response = await client.patch(
+            "/task/batch",
+            json={"ids": ids[:2] + [999999], "done": True},
+            headers=bot_auth_header,
+        )
+        assert response.status_code == 200
+        assert sorted(response.json()["ids"]) == ids[:2]
+
+        response = await client.delete(
+            f"/task/?user_id={user_id}&done=true", headers=bot_auth_header
+        )
+        assert response.status_code == 200
+        assert sorted(response.json()["ids"]) == ids[:2]
+
+        remaining = await client.get(
+            f"/task/?user_id={user_id}", headers=bot_auth_header
+        )
+        assert [t["id"] for t in remaining.json()] == ids[2:]
+
+        # Без done очищаются только выполненные, открытые задачи остаются
+        response = await client.delete(
+            f"/task/?user_id={user_id}", headers=bot_auth_header
+        )
+        assert response.json()["ids"] == []
+
+    async def test_slow_query_log_records_route(
+        self,
+        client: httpx.AsyncClient,
+        bot_auth_header: dict,
+        created_task: dict,
+        caplog: pytest.LogCaptureFixture,
+    ):
+        """Проверка, что журнал медленных запросов пишет отпечаток и маршрут."""
+        slow_log = SlowQueryLog(threshold_ms=0, sample_rate=1)
+        slow_log.install(engine.sync_engine)
+
+        try:
+            with caplog.at_level("WARNING", logger="task_tracker.slow_query"):
+                await client.get(f"/task/{created_task['id']}", headers=bot_auth_header)
+        finally:
+            slow_log.remove(engine.sync_engine)
+
+        record = caplog.records[-1]
+        assert record.route == "GET /task/{task_id}"
+        assert len(record.fingerprint) == 12
+        assert "WHERE tasks.id = ?" in record.getMessage()
+
+    async def test_slow_query_log_survives_failed_statements(self):
+        """Проверка, что упавшие запросы не оставляют отметок в соединении."""
+        slow_log = SlowQueryLog(threshold_ms=60_000, sample_rate=1)
+        slow_log.install(engine.sync_engine)
+
+        try:
+            async with engine.connect() as conn:
+                for _ in range(3):
+                    with pytest.raises(OperationalError):
+                        await conn.execute(text("SELECT * FROM no_such_table"))
+
+                    await conn.rollback()
+
+                await conn.execute(text("SELECT 1"))
+                info = (await conn.get_raw_connection()).info
+                assert "query_start_time" not in info
+        finally:
+            slow_log.remove(engine.sync_engine)
+
+
+# --- 5. Тесты условных запросов (ETag) ---
+
+
+@pytest.mark.asyncio
+class TestTaskETag:
+
+    @pytest.fixture
+    def override_dependencies(self, db_session: AsyncSession):
+        """Подменяет TaskTrackerApp на вариант с кэшем задач."""
+        user_repo = SQLAlchemyUserRepository(db_session)
+        cache = TaskCache(InMemoryCacheBackend(LRUCache(maxsize=100)))
+        task_repo = SQLAlchemyTaskRepository(db_session, cache)
+        tracker_app = TaskTrackerApp(
+            user_service=UserService(user_repo),
+            task_service=TaskService(task_repo, user_repo),
+        )
+        app.dependency_overrides[get_app_instance] = lambda: tracker_app
+
+        yield
+
+        app.dependency_overrides.clear()
+
+    async def test_list_tasks_not_modified(
+        self,
+        client: httpx.AsyncClient,
+        bot_auth_header: dict,
+        registered_user_data: dict,
+        db_session: AsyncSession,
+    ):
+        """Проверка 304 на неизменный список и нового ETag после записи."""
+        user_id = registered_user_data["id"]
+        created = await client.post(
+            "/task/",
+            json={"user_id": user_id, "text": "Опрос"},
+            headers=bot_auth_header,
+        )
+        await run_commit_hooks(db_session)
+
+        first = await client.get(f"/task/?user_id={user_id}", headers=bot_auth_header)
+        etag = first.headers["ETag"]
+
+        cached = await client.get(
+            f"/task/?user_id={user_id}",
+            headers={**bot_auth_header, "If-None-Match": etag},
+        )
+        assert cached.status_code == 304
+        assert cached.content == b""
+
+        # У страницы списка свой ETag
+        page = await client.get(
+            f"/task/?user_id={user_id}&limit=1",
+            headers={**bot_auth_header, "If-None-Match": etag},
+        )
+        assert page.status_code == 200
+        assert page.headers["ETag"] != etag
+
+        # Фильтр и порядок тоже меняют представление
+        for params in ("done=true", "direction=desc", "order_by=due_date"):
+            filtered = await client.get(
+                f"/task/?user_id={user_id}&{params}",
+                headers={**bot_auth_header, "If-None-Match": etag},
+            )
+            assert filtered.status_code == 200
+
+        task_id = created.json()["id"]
+        task = await client.get(f"/task/{task_id}", headers=bot_auth_header)
+        task_etag = task.headers["ETag"]
+        cached_task = await client.get(
+            f"/task/{task_id}", headers={**bot_auth_header, "If-None-Match": task_etag}
+        )
+        assert cached_task.status_code == 304
+
+        await client.patch(
+            f"/task/{task_id}", json={"done": True}, headers=bot_auth_header
+        )
+        await run_commit_hooks(db_session)
+
+        changed = await client.get(
+            f"/task/?user_id={user_id}",
+            headers={**bot_auth_header, "If-None-Match": etag},
+        )
+        assert changed.status_code == 200
+        assert changed.headers["ETag"] != etag
+        assert changed.json()[0]["done"] is True
+
+        changed_task = await client.get(
+            f"/task/{task_id}", headers={**bot_auth_header, "If-None-Match": task_etag}
+        )
+        assert changed_task.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_read_your_writes_routes_reads_to_primary(
+    db_session: AsyncSession, monkeypatch
+):
+    """Проверяет, что чтения недавно писавшего пользователя идут в основную базу."""
+
+    def request(method: str, query: str = "", **path_params) -> Request:
+        return Request(
+            {
+                "type": "http",
+                "method": method,
+                "query_string": query.encode(),
+                "headers": [],
+                "path_params": path_params,
+            }
+        )
+
+    monkeypatch.setattr(database, "recent_writes", RecentWrites(window_s=60))
+
+    assert database.session_factory_for(request("POST")) is (
+        database.AsyncSessionFactory
+    )
+    assert database.session_factory_for(request("GET", "user_id=1")) is (
+        database.ReadSessionFactory
+    )
+
+    user = await SQLAlchemyUserRepository(db_session).save(
+        User(id=None, telegram_id=77)
+    )
+    assert database.session_factory_for(request("GET", f"user_id={user.id}")) is (
+        database.ReadSessionFactory
+    )
+
+    # Окно открывается только после COMMIT
+    await run_commit_hooks(db_session)
+    assert database.session_factory_for(request("GET", f"user_id={user.id}")) is (
+        database.AsyncSessionFactory
+    )
+    assert database.session_factory_for(request("GET", task_id="5")) is (
+        database.ReadSessionFactory
+    )
+
+
+@pytest.mark.asyncio
+async def test_finish_session_skips_commit_for_reads():
+    """Проверяет, что чтение не делает COMMIT, а запись фиксируется один раз."""
+    commits = []
+
+    def on_commit_event(conn):
+        commits.append(conn)
+
+    event.listen(engine.sync_engine, "commit", on_commit_event)
+
+    try:
+        read = database.AsyncSessionFactory()
+        read.info["read_only"] = True
+        await read.execute(text("SELECT 1"))
+        await database.finish_session(read)
+        assert commits == []
+        assert engine.pool.checkedout() == 0
+
+        hooks = []
+        write = database.AsyncSessionFactory()
+
+        async def hook():
+            hooks.append(True)
+
+        await write.execute(text("SELECT 1"))
+        database.on_commit(write, hook)
+        await database.finish_session(write)
+        await database.finish_session(write)
+        assert len(commits) == 1
+        assert hooks == [True]
+        assert engine.pool.checkedout() == 0
+    finally:
+        event.remove(engine.sync_engine, "commit", on_commit_event)
+
+
+def test_dump_tasks_matches_response_model():
+    """Проверяет, что быстрый сериализатор отдает ровно поля TaskResponse."""
+    creator = User(id=1, telegram_id=10)
+    tasks = [
+        Task(id=1, text="Первая", creator=creator),
+        Task(
+            id=2, text="Вторая", creator=creator, done=True, due_date=date(2025, 1, 1)
+        ),
+    ]
+
+    assert json.loads(dump_tasks(tasks)) == [
+        TaskResponse.model_validate(task).model_dump(mode="json") for task in tasks
+    ]
+
+
+@pytest.mark.asyncio
+async def test_production_dependencies_commit_and_read(bot_auth_header: dict):
+    """
+    Проверяет путь без подмен: lifespan собирает TaskTrackerApp, а запросы
+    идут через get_app_instance, get_session, RequestSession и SessionRoute.
+    """
+    app.dependency_overrides.clear()
+
+    async with lifespan(app):
+        async with httpx.AsyncClient(
+            transport=ASGITransport(app=app), base_url="http://test"
+        ) as client:
+            created = await client.post(
+                "/user/", json={"telegram_id": 15015}, headers=bot_auth_header
+            )
+            assert created.status_code == 200
+            user_id = created.json()["id"]
+
+            try:
+                task = await client.post(
+                    "/task/",
+                    json={"user_id": user_id, "text": "Без подмен"},
+                    headers=bot_auth_header,
+                )
+                assert task.status_code == 200
+
+                # Чтение в новой сессии видит зафиксированную запись
+                fetched = await client.get(
+                    f"/task/{task.json()['id']}", headers=bot_auth_header
+                )
+                assert fetched.status_code == 200
+                assert fetched.json()["text"] == "Без подмен"
+
+                stats = await client.get(
+                    f"/user/{user_id}/stats", headers=bot_auth_header
+                )
+                assert stats.json() == {"total": 1, "open": 1, "done": 0}
+            finally:
+                deleted = await client.delete(
+                    f"/user/{user_id}", headers=bot_auth_header
+                )
+                assert deleted.status_code == 200
+
+    assert engine.pool.checkedout() == 0
+
+
+@pytest.mark.asyncio
+async def test_session_route_finishes_session_once(bot_auth_header: dict, monkeypatch):
+    """Проверяет, что маршрут из include_router завершает сессию один раз."""
+    finished = []
+
+    async def counting_finish(session: AsyncSession) -> None:
+        finished.append(session)
+        await database.finish_session(session)
+
+    monkeypatch.setattr(route, "finish_session", counting_finish)
+    app.dependency_overrides.clear()
+
+    async with lifespan(app):
+        async with httpx.AsyncClient(
+            transport=ASGITransport(app=app), base_url="http://test"
+        ) as client:
+            response = await client.get(
+                "/task/due?before=2000-01-01", headers=bot_auth_header
+            )
+
+    assert response.status_code == 200
+    assert len(finished) == 1
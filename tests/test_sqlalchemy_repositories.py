@@ -1,3 +1,7 @@
+import asyncio
+import json
+from contextlib import asynccontextmanager
+from datetime import date, datetime, timedelta, timezone
 from os import getenv, path
 from sys import path as syspath
 
@@ -5,14 +9,35 @@ syspath.insert(0, path.abspath(path.join(path.dirname(__file__), "..")))
 
 from typing import AsyncGenerator
 
+import httpx
 import pytest
 import pytest_asyncio
+from alembic import command
+from alembic.autogenerate import compare_metadata
+from alembic.config import Config
+from alembic.migration import MigrationContext
+from sqlalchemy import create_engine, event
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
 
 from infrastructure.db.database import engine
+from application.archive import TaskArchiver
+from application.dependencies import TaskTrackerApp
+from application.purge import UserPurger
+from infrastructure.cache import InMemoryCacheBackend, LRUCache
+from infrastructure.db.database import build_writer_engine, run_commit_hooks
 from infrastructure.db.models import Base
+from infrastructure.db.search import include_object
+from infrastructure.db.settings import DatabaseSettings
+from infrastructure.db.write_pipeline import WritePipeline
+from exceptions import TaskNotFoundError
+from user.cached_repository import CachedUserRepository
 from user.sql_repository import SQLAlchemyUserRepository, User
+from task.cache import TaskCache
+from task.domain.model import TaskCounts, TaskListQuery
+from task.reminders import ReminderScheduler, utc_today
+from task.service import TaskService
+from user.service import UserService
 from task.sql_repository import SQLAlchemyTaskRepository, Task
 
 
@@ -55,6 +80,19 @@ async def db_session() -> AsyncGenerator[AsyncSession, None]:
             await async_session.close()
 
 
+@pytest.fixture
+def statements():
+    """Собирает SQL-запросы, отправленные в базу во время теста."""
+    executed = []
+
+    def collect(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", collect)
+    yield executed
+    event.remove(engine.sync_engine, "before_cursor_execute", collect)
+
+
 @pytest_asyncio.fixture  # <-- Использован pytest_asyncio.fixture
 async def user_repo(db_session: AsyncSession) -> SQLAlchemyUserRepository:
     """Фикстура для UserRepository."""
@@ -112,6 +150,27 @@ class TestSQLAlchemyUserRepository:
         assert await user_repo.exists_by_telegram_id(telegram_id) is True
         assert await user_repo.exists_by_telegram_id(999999) is False
 
+    async def test_create_by_telegram_id(
+        self, user_repo: SQLAlchemyUserRepository, statements: list
+    ):
+        """Проверяет регистрацию одним запросом без ошибки на дубликате."""
+        statements.clear()
+        user = await user_repo.create_by_telegram_id(90008)
+
+        assert user is not None and user.telegram_id == 90008
+        assert len(statements) == 1
+        assert await user_repo.get_user(user.id) == user
+
+        statements.clear()
+        assert await user_repo.create_by_telegram_id(90008) is None
+        assert len(statements) == 1
+
+        service = UserService(user_repo)
+        assert await service.get_or_create_user(90008) == (user, False)
+
+        created, is_new = await service.get_or_create_user(90009)
+        assert is_new is True and created.telegram_id == 90009
+
     async def test_delete_user(self, user_repo: SQLAlchemyUserRepository):
         """Проверяет удаление пользователя."""
         user_to_delete = await user_repo.save(User(id=None, telegram_id=90004))
@@ -127,6 +186,53 @@ class TestSQLAlchemyUserRepository:
         # # Проверяем удаление несуществующего
         assert not (await user_repo.delete_user(9999991))
 
+    async def test_delete_user_with_tasks(
+        self, user_repo: SQLAlchemyUserRepository, statements: list
+    ):
+        """Проверяет удаление пользователя с задачами фиксированным числом запросов."""
+        user = await user_repo.save(User(id=None, telegram_id=90006))
+        task_repo = SQLAlchemyTaskRepository(user_repo.session)
+        saved = await task_repo.save_many(
+            [Task(id=None, text=f"Молоко {i}", creator=user) for i in range(50)]
+        )
+        await task_repo.set_done_many([task.id for task in saved[:10]], True)
+        await task_repo.archive_done(datetime.now(timezone.utc) + timedelta(1), 100)
+
+        statements.clear()
+        assert await user_repo.delete_user(user.id) is True
+        assert len(statements) == 4
+
+        assert await task_repo.counts_by_user(user.id) is None
+        assert await task_repo.search_by_user(user, "молоко") == []
+        with pytest.raises(ValueError):
+            await user_repo.get_user(user.id)
+
+    async def test_purge_user_in_batches(
+        self, user_repo: SQLAlchemyUserRepository, statements: list
+    ):
+        """Проверяет фоновое удаление пользователя пачками задач."""
+        task_repo = SQLAlchemyTaskRepository(user_repo.session)
+        tracker = TaskTrackerApp(
+            user_service=UserService(user_repo),
+            task_service=TaskService(task_repo, user_repo),
+        )
+        purger = UserPurger(tracker, batch_size=2)
+        user = await user_repo.save(User(id=None, telegram_id=90007))
+        saved = await task_repo.save_many(
+            [Task(id=None, text=f"Пункт {i}", creator=user) for i in range(8)]
+        )
+        await task_repo.set_done_many([task.id for task in saved[:4]], True)
+        await task_repo.archive_done(datetime.now(timezone.utc) + timedelta(1), 100)
+
+        statements.clear()
+        assert await purger.purge(user.id) is True
+
+        # 4 задачи в tasks и 4 в архиве: пачки по 2 из tasks, затем из архива,
+        # и последняя неполная пачка
+        batches = [s for s in statements if " WHERE tasks_archive.id IN " in s]
+        assert len(batches) == 3
+        assert not await user_repo.exists_by_telegram_id(90007)
+
     async def test_get_user_id_by_telegram_id(
         self, user_repo: SQLAlchemyUserRepository
     ):
@@ -140,6 +246,67 @@ class TestSQLAlchemyUserRepository:
             assert await user_repo.get_user_by_telegram_id(999999) is None
 
 
+@pytest.mark.asyncio
+class TestCachedUserRepository:
+    """Тесты для кэширующей обертки над UserRepository."""
+
+    @pytest.fixture
+    def cached_repo(self, db_session: AsyncSession) -> CachedUserRepository:
+        cache = LRUCache(maxsize=10, ttl=60)
+        inner = SQLAlchemyUserRepository(db_session, telegram_cache=cache)
+
+        return CachedUserRepository(inner, cache)
+
+    async def test_telegram_lookup_is_cached(
+        self, cached_repo: CachedUserRepository, statements: list
+    ):
+        """Проверяет, что повторный поиск по telegram_id не ходит в базу."""
+        user = await cached_repo.save(User(id=None, telegram_id=91001))
+
+        statements.clear()
+        assert await cached_repo.get_by_telegram_id(91001) == user
+        assert len(statements) == 1
+
+        statements.clear()
+        assert await cached_repo.get_user_by_telegram_id(91001) == user.id
+        assert statements == []
+        assert cached_repo.cache.stats() == {"size": 1, "hits": 1, "misses": 1}
+
+    async def test_create_checks_database_despite_cache(
+        self, cached_repo: CachedUserRepository, db_session: AsyncSession
+    ):
+        """Проверяет, что запись в кэше не мешает зарегистрировать удаленного."""
+        user = await cached_repo.create_by_telegram_id(91003)
+        assert await cached_repo.create_by_telegram_id(91003) is None
+
+        # Удаление другим процессом: кэш этого процесса о нем не знает
+        await SQLAlchemyUserRepository(db_session).delete_user(user.id)
+        assert await cached_repo.get_by_telegram_id(91003) == user
+
+        created = await cached_repo.create_by_telegram_id(91003)
+        assert created is not None
+        assert await cached_repo.get_by_telegram_id(91003) == created
+
+    async def test_delete_user_invalidates_cache(
+        self, cached_repo: CachedUserRepository, db_session: AsyncSession
+    ):
+        """Проверяет, что удаление пользователя сбрасывает кэш после COMMIT."""
+        user = await cached_repo.save(User(id=None, telegram_id=91002))
+        await cached_repo.get_by_telegram_id(91002)
+        assert user.id
+
+        assert await cached_repo.delete_user(user.id) is True
+        assert len(cached_repo.cache) == 1
+
+        await run_commit_hooks(db_session)
+        assert len(cached_repo.cache) == 0
+
+        with pytest.raises(ValueError):
+            await cached_repo.get_by_telegram_id(91002)
+
+        assert await cached_repo.delete_user(user.id) is False
+
+
 @pytest.mark.asyncio
 class TestSQLAlchemyTaskRepository:
     """Тесты для SQLAlchemyTaskRepository."""
@@ -226,3 +393,531 @@ class TestSQLAlchemyTaskRepository:
         with pytest.raises(ValueError):
             assert await task_repo.get_by_id(task_to_delete.id)  # is None
             assert await task_repo.delete_task(999999)  # is False
+
+    async def test_list_tasks_by_user_keyset(
+        self, task_repo: SQLAlchemyTaskRepository, setup_user: User
+    ):
+        """Проверяет keyset-пагинацию списка задач."""
+        saved = [
+            await task_repo.save(Task(id=None, text=f"Задача {i}", creator=setup_user))
+            for i in range(5)
+        ]
+
+        page = await task_repo.list_by_user(setup_user, limit=2, after_id=saved[1].id)
+
+        assert [t.id for t in page] == [saved[2].id, saved[3].id]
+
+    @pytest.mark.parametrize("direction", ["asc", "desc"])
+    async def test_list_tasks_by_due_date_pages(
+        self, task_repo: SQLAlchemyTaskRepository, setup_user: User, direction: str
+    ):
+        """Проверяет keyset по сроку: задачи без срока в конце, фильтр done."""
+        due_dates = [date(2026, 1, 3), None, date(2026, 1, 1), date(2026, 1, 3), None]
+        saved = await task_repo.save_many(
+            [
+                Task(
+                    id=None,
+                    text=f"Срок {i}",
+                    creator=setup_user,
+                    due_date=due,
+                    done=i != 4,
+                )
+                for i, due in enumerate(due_dates)
+            ]
+        )
+        query = TaskListQuery(order_by="due_date", direction=direction)
+        descending = direction == "desc"
+        dated = sorted(
+            (t for t in saved if t.due_date),
+            key=lambda t: (t.due_date, t.id),
+            reverse=descending,
+        )
+        undated = sorted(
+            (t for t in saved if not t.due_date), key=lambda t: t.id, reverse=descending
+        )
+
+        pages, after = [], None
+        while True:
+            page = await task_repo.list_by_user(
+                setup_user,
+                limit=2,
+                after_id=after.id if after else None,
+                query=query,
+                after_due_date=after.due_date if after else None,
+            )
+            pages.append([t.id for t in page])
+            if len(page) < 2:
+                break
+            after = page[-1]
+
+        assert sum(pages, []) == [t.id for t in dated + undated]
+
+        query.done = False
+        assert [
+            t.id for t in await task_repo.list_by_user(setup_user, query=query)
+        ] == [saved[4].id]
+
+    async def test_search_tasks_ranked_pages(
+        self, task_repo: SQLAlchemyTaskRepository, setup_user: User
+    ):
+        """Проверяет поиск по префиксам, порядок по рангу и синхронизацию индекса."""
+        saved = await task_repo.save_many(
+            [
+                Task(id=None, text=text, creator=setup_user)
+                for text in (
+                    "Купить молоко",
+                    "Молоко, молоко и еще раз молоко",
+                    "Позвонить маме",
+                    "Молоток вернуть соседу",
+                )
+            ]
+        )
+
+        hits = await task_repo.search_by_user(setup_user, "МОЛОКО")
+        assert [h.task.id for h in hits] == [saved[1].id, saved[0].id]
+
+        first = await task_repo.search_by_user(setup_user, "мол", limit=2)
+        rest = await task_repo.search_by_user(
+            setup_user, "мол", limit=2, after=(first[-1].rank, first[-1].task.id)
+        )
+        assert sorted(h.task.id for h in first + rest) == sorted(
+            [saved[0].id, saved[1].id, saved[3].id]
+        )
+
+        await task_repo.delete_task(saved[0].id)
+        assert [
+            h.task.id for h in await task_repo.search_by_user(setup_user, "купить")
+        ] == []
+        assert await task_repo.search_by_user(setup_user, '"*') == []
+
+    async def test_list_tasks_by_user_is_projection(
+        self, task_repo: SQLAlchemyTaskRepository, setup_user: User, statements: list
+    ):
+        """Проверяет, что список читается одним запросом без JOIN с users."""
+        await task_repo.save(Task(id=None, text="Проекция", creator=setup_user))
+
+        statements.clear()
+        tasks = await task_repo.list_by_user(setup_user)
+
+        assert len(statements) == 1
+        assert "JOIN" not in statements[0].upper()
+        assert all(task.creator is setup_user for task in tasks)
+
+    async def test_save_many_assigns_ids_in_order(
+        self, task_repo: SQLAlchemyTaskRepository, setup_user: User, statements: list
+    ):
+        """Проверяет пакетную вставку задач одним запросом."""
+        tasks = [Task(id=None, text=f"Пункт {i}", creator=setup_user) for i in range(3)]
+        tasks += [Task(id=None, text="Повтор", creator=setup_user) for _ in range(200)]
+
+        statements.clear()
+        saved = await task_repo.save_many(tasks)
+
+        # Один INSERT задач и один upsert счетчиков, без запроса на строку
+        assert len(statements) == 2
+        assert len({t.id for t in saved}) == len(tasks)
+        assert [t.id for t in saved] == sorted(t.id for t in saved)
+
+        fetched = await task_repo.list_by_user(setup_user)
+        assert [t.text for t in fetched] == [t.text for t in tasks]
+
+    async def test_write_operations_are_single_statements(
+        self, task_repo: SQLAlchemyTaskRepository, setup_user: User, statements: list
+    ):
+        """
+        Проверяет, что создание, обновление и смена статуса — один запрос
+        к задачам и один к счетчикам пользователя.
+        """
+        statements.clear()
+        task = await task_repo.save(
+            Task(id=None, text="Один запрос", creator=setup_user)
+        )
+        assert len(statements) == 2
+
+        statements.clear()
+        task.text = "Новый текст"
+        await task_repo.save(task)
+        assert len(statements) == 2
+
+        statements.clear()
+        assert task.id
+        toggled = await task_repo.set_done(task.id, True)
+        assert len(statements) == 2
+        assert toggled.done is True
+        assert toggled.text == "Новый текст"
+        assert toggled.creator == setup_user
+
+    async def test_list_version_is_shared_by_repositories(
+        self, db_session: AsyncSession, setup_user: User, statements: list
+    ):
+        """Проверяет, что версия списка хранится в базе, а не в кэше процесса."""
+        writer = SQLAlchemyTaskRepository(db_session)
+        reader = SQLAlchemyTaskRepository(db_session)
+        assert await reader.list_version(setup_user.id) is None
+
+        task = await writer.save(Task(id=None, text="Версия", creator=setup_user))
+        statements.clear()
+        version = await reader.list_version(setup_user.id)
+        assert len(statements) == 1
+        assert await reader.task_version(task.id) == version
+
+        task.text = "Другой текст"
+        await writer.save(task)
+        assert await reader.list_version(setup_user.id) != version
+
+        version = await reader.list_version(setup_user.id)
+        await writer.set_done(task.id, False)
+        assert await reader.list_version(setup_user.id) == version
+
+    async def test_set_done_missing_task_raises(
+        self, task_repo: SQLAlchemyTaskRepository
+    ):
+        """Проверяет смену статуса несуществующей задачи."""
+        with pytest.raises(ValueError):
+            await task_repo.set_done(999999, True)
+
+    async def test_get_by_id_read_through_cache(
+        self, db_session: AsyncSession, setup_user: User, statements: list
+    ):
+        """Проверяет кэширование get_by_id и сброс кэша только после COMMIT."""
+        cache = TaskCache(InMemoryCacheBackend(LRUCache(maxsize=10)))
+        cached_repo = SQLAlchemyTaskRepository(db_session, cache)
+        task = await cached_repo.save(
+            Task(id=None, text="Карточка", creator=setup_user)
+        )
+        assert task.id
+
+        await cached_repo.get_by_id(task.id)
+        statements.clear()
+        assert await cached_repo.get_by_id(task.id) == task
+        assert statements == []
+
+        await cached_repo.set_done(task.id, True)
+        assert (await cache.get(task.id)).done is False
+
+        await run_commit_hooks(db_session)
+        assert await cache.get(task.id) is None
+        assert (await cached_repo.get_by_id(task.id)).done is True
+
+    async def test_counts_follow_writes(
+        self, task_repo: SQLAlchemyTaskRepository, setup_user: User, statements: list
+    ):
+        """Проверяет, что счетчики задач совпадают с COUNT(*) после записей."""
+        assert await task_repo.counts_by_user(setup_user.id) == TaskCounts()
+        assert await task_repo.counts_by_user(999999) is None
+
+        saved = await task_repo.save_many(
+            [Task(id=None, text=f"Счет {i}", creator=setup_user) for i in range(4)]
+        )
+        await task_repo.save(
+            Task(id=None, text="Готово", creator=setup_user, done=True)
+        )
+        await task_repo.set_done_many([saved[0].id, saved[1].id], True)
+        await task_repo.set_done_many([saved[0].id], True)
+        # Повторное нажатие «выполнено» не сдвигает счетчики второй раз
+        assert (await task_repo.set_done(saved[0].id, True)).done is True
+        await task_repo.set_done(saved[1].id, False)
+        saved[2].done = True
+        await task_repo.save(saved[2])
+        await task_repo.delete_task(saved[3].id)
+        await task_repo.delete_by_user(setup_user.id, done=True)
+        await task_repo.save(Task(id=None, text="Еще", creator=setup_user))
+
+        tasks = await task_repo.list_by_user(setup_user)
+        statements.clear()
+        counts = await task_repo.counts_by_user(setup_user.id)
+
+        assert len(statements) == 1
+        assert counts == TaskCounts(
+            open=sum(not t.done for t in tasks), done=sum(t.done for t in tasks)
+        )
+        assert counts.total == len(tasks) == 2
+
+    async def test_list_due_tasks_of_all_users(
+        self,
+        task_repo: SQLAlchemyTaskRepository,
+        user_repo: SQLAlchemyUserRepository,
+        setup_user: User,
+    ):
+        """Проверяет выборку незакрытых задач всех пользователей по сроку."""
+        other = await user_repo.save(User(id=None, telegram_id=90077))
+        saved = await task_repo.save_many(
+            [
+                Task(id=None, text="a", creator=setup_user, due_date=date(2030, 1, 2)),
+                Task(id=None, text="b", creator=other, due_date=date(2030, 1, 1)),
+                Task(
+                    id=None,
+                    text="c",
+                    creator=setup_user,
+                    due_date=date(2030, 1, 1),
+                    done=True,
+                ),
+                Task(id=None, text="d", creator=other, due_date=date(2030, 1, 5)),
+                Task(id=None, text="e", creator=other),
+            ]
+        )
+        since = {"after_id": 0, "after_due_date": date(2030, 1, 1)}
+
+        due = await task_repo.list_due(date(2030, 1, 5), **since)
+        assert [t.id for t in due] == [saved[1].id, saved[0].id]
+        assert due[0].creator == other
+
+        first = await task_repo.list_due(limit=2, **since)
+        rest = await task_repo.list_due(
+            limit=2, after_id=first[-1].id, after_due_date=first[-1].due_date
+        )
+        assert [t.id for t in first + rest] == [saved[1].id, saved[0].id, saved[3].id]
+
+    async def test_archive_done_tasks(
+        self,
+        task_repo: SQLAlchemyTaskRepository,
+        user_repo: SQLAlchemyUserRepository,
+        setup_user: User,
+    ):
+        """Проверяет перенос выполненных задач в архив и списки с архивом."""
+        saved = await task_repo.save_many(
+            [Task(id=None, text=f"Архив {i}", creator=setup_user) for i in range(5)]
+        )
+        ids = [task.id for task in saved]
+        await task_repo.set_done_many(ids[:3], True)
+        await task_repo.set_done(ids[2], False)
+
+        # Задачи выполнены только что: старше суток в архив нечего переносить
+        long_ago = datetime.now(timezone.utc) - timedelta(days=1)
+        assert await task_repo.archive_done(long_ago, 10) == []
+
+        tracker = TaskTrackerApp(
+            user_service=UserService(user_repo),
+            task_service=TaskService(task_repo, user_repo),
+        )
+        archiver = TaskArchiver(tracker, after_days=-1, batch_size=1)
+        assert await archiver.compact() == 2
+
+        hot = await task_repo.list_by_user(setup_user)
+        assert [t.id for t in hot] == ids[2:]
+
+        query = TaskListQuery(include_archived=True)
+        everything = await task_repo.list_by_user(setup_user, query=query)
+        assert [t.id for t in everything] == ids
+
+        query = TaskListQuery(done=True, direction="desc", include_archived=True)
+        page = await task_repo.list_by_user(setup_user, limit=1, query=query)
+        rest = await task_repo.list_by_user(
+            setup_user, after_id=page[-1].id, query=query
+        )
+        assert [t.id for t in page + rest] == [ids[1], ids[0]]
+
+        with pytest.raises(TaskNotFoundError):
+            await task_repo.get_by_id(ids[0])
+
+        counts = await task_repo.counts_by_user(setup_user.id)
+        assert counts == TaskCounts(open=3, done=2)
+
+        exported = [row["id"] async for row in task_repo.stream_by_user(setup_user)]
+        assert exported == ids
+
+        # Архивные задачи удаляются так же, как горячие, вместе со счетчиками
+        assert await task_repo.delete_task(ids[0]) is True
+        assert await task_repo.delete_by_user(setup_user.id, done=True) == [ids[1]]
+        counts = await task_repo.counts_by_user(setup_user.id)
+        assert counts == TaskCounts(open=3, done=0)
+
+        with pytest.raises(TaskNotFoundError):
+            await task_repo.delete_task(ids[0])
+
+
+@pytest.mark.asyncio
+class TestReminderScheduler:
+    """Тесты планировщика напоминаний с заглушкой вебхука."""
+
+    @pytest_asyncio.fixture
+    async def setup_user(self, user_repo: SQLAlchemyUserRepository) -> User:
+        return await user_repo.save(User(id=None, telegram_id=88999))
+
+    @pytest.fixture
+    def webhook(self):
+        """Локальная заглушка вебхука: запоминает полученные пачки."""
+        received, statuses = [], []
+        arrived = asyncio.Event()
+
+        def handle(request: httpx.Request) -> httpx.Response:
+            status = statuses.pop(0) if statuses else 200
+
+            if status == 200:
+                received.append(
+                    [r["task_id"] for r in json.loads(request.content)["reminders"]]
+                )
+                arrived.set()
+
+            return httpx.Response(status)
+
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handle))
+        return client, received, statuses, arrived
+
+    def make_scheduler(self, db_session, client) -> ReminderScheduler:
+        @asynccontextmanager
+        async def session_factory():
+            yield db_session
+
+        return ReminderScheduler(
+            session_factory,
+            SQLAlchemyTaskRepository,
+            "http://reminders.test/hook",
+            batch_size=2,
+            client=client,
+            since=utc_today(),
+        )
+
+    async def test_dispatches_due_tasks_in_batches(
+        self, db_session: AsyncSession, setup_user: User, webhook
+    ):
+        """Проверяет отправку наступивших сроков пачками и повтор после ошибки."""
+        client, received, statuses, _ = webhook
+        scheduler = self.make_scheduler(db_session, client)
+        today = utc_today()
+        saved = await SQLAlchemyTaskRepository(db_session).save_many(
+            [
+                Task(id=None, text="a", creator=setup_user, due_date=today),
+                Task(id=None, text="b", creator=setup_user, due_date=today, done=True),
+                Task(id=None, text="c", creator=setup_user, due_date=today),
+                Task(id=None, text="d", creator=setup_user, due_date=today),
+                Task(
+                    id=None,
+                    text="e",
+                    creator=setup_user,
+                    due_date=today + timedelta(days=1),
+                ),
+            ]
+        )
+
+        statuses.append(500)
+        with pytest.raises(httpx.HTTPStatusError):
+            await scheduler.dispatch_due()
+
+        assert await scheduler.dispatch_due() == 3
+        assert received == [[saved[0].id, saved[2].id], [saved[3].id]]
+        assert await scheduler.dispatch_due() == 0
+
+    async def test_wakes_up_for_new_task(
+        self, db_session: AsyncSession, setup_user: User, webhook
+    ):
+        """Проверяет, что задача со сроком сегодня будит спящий планировщик."""
+        client, received, _, arrived = webhook
+        scheduler = self.make_scheduler(db_session, client)
+        repo = SQLAlchemyTaskRepository(db_session, reminders=scheduler)
+        await repo.save(
+            Task(
+                id=None,
+                text="later",
+                creator=setup_user,
+                due_date=utc_today() + timedelta(days=3),
+            )
+        )
+
+        scheduler.start()
+        try:
+            await asyncio.sleep(0.05)
+            assert received == []
+
+            task = await repo.save(
+                Task(id=None, text="now", creator=setup_user, due_date=utc_today())
+            )
+            await run_commit_hooks(db_session)
+            await asyncio.wait_for(arrived.wait(), 1)
+        finally:
+            await scheduler.close()
+
+        assert received == [[task.id]]
+
+
+@pytest.mark.asyncio
+class TestWritePipeline:
+    """Тесты очереди записи SQLite с групповым COMMIT."""
+
+    @pytest_asyncio.fixture
+    async def pipeline(self, tmp_path):
+        settings = DatabaseSettings(
+            database_url=f"sqlite+aiosqlite:///{tmp_path / 'writer.db'}"
+        )
+        writer_engine = build_writer_engine(settings)
+
+        async with writer_engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+        pipeline = WritePipeline(writer_engine, max_batch=16, max_delay_ms=20)
+        yield pipeline
+        await pipeline.close()
+
+    async def test_concurrent_writes_share_commit(self, pipeline: WritePipeline):
+        """Проверяет групповой COMMIT и изоляцию ошибки одной операции."""
+
+        def save(telegram_id: int):
+            return pipeline.submit(
+                lambda s: SQLAlchemyUserRepository(s).save(
+                    User(id=None, telegram_id=telegram_id)
+                )
+            )
+
+        await save(1)
+        results = await asyncio.gather(
+            *(save(telegram_id) for telegram_id in (2, 3, 1, 4, 5)),
+            return_exceptions=True,
+        )
+
+        assert isinstance(results[2], IntegrityError)
+        assert [user.telegram_id for user in results if isinstance(user, User)] == [
+            2,
+            3,
+            4,
+            5,
+        ]
+        assert pipeline.operations == 6
+        assert pipeline.batches < pipeline.operations
+
+        # Писатель держит единственное соединение движка
+        await pipeline.close()
+
+        async with AsyncSession(pipeline.engine) as session:
+            users = await SQLAlchemyUserRepository(session).get_users_by_telegram_ids(
+                [1, 2, 3, 4, 5]
+            )
+        assert sorted(users) == [1, 2, 3, 4, 5]
+
+
+def test_postgres_connect_args_match_driver():
+    """Проверяет, что параметры asyncpg не передаются другим драйверам."""
+    asyncpg = DatabaseSettings(
+        database_url="postgresql+asyncpg://u:p@db/app", statement_cache_size=0
+    )
+    psycopg = DatabaseSettings(database_url="postgresql+psycopg://u:p@db/app")
+
+    assert asyncpg.engine_kwargs()["connect_args"] == {"statement_cache_size": 0}
+    assert asyncpg.engine_kwargs(read_only=True)["connect_args"]["server_settings"] == {
+        "default_transaction_read_only": "on"
+    }
+    assert psycopg.engine_kwargs()["connect_args"] == {}
+    assert psycopg.engine_kwargs(read_only=True)["connect_args"] == {
+        "options": "-c default_transaction_read_only=on"
+    }
+
+
+def test_migrations_match_models(tmp_path):
+    """Проверяет, что миграции Alembic дают ту же схему, что и модели."""
+    db_path = tmp_path / "migrated.db"
+    config = Config()
+    config.set_main_option(
+        "script_location", path.join(path.dirname(__file__), "..", "alembic")
+    )
+    config.set_main_option("sqlalchemy.url", f"sqlite+aiosqlite:///{db_path}")
+    command.upgrade(config, "head")
+
+    sync_engine = create_engine(f"sqlite:///{db_path}")
+
+    with sync_engine.connect() as connection:
+        context = MigrationContext.configure(
+            connection, opts={"include_object": include_object}
+        )
+        diff = compare_metadata(context, Base.metadata)
+
+    sync_engine.dispose()
+    assert diff == []
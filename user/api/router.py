@@ -1,11 +1,19 @@
 from dotenv import load_dotenv
 from os import getenv
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response
 from fastapi.security import APIKeyHeader
 
 from application.dependencies import TaskTrackerApp, get_app_instance, verify_bot_token
-from user.api.schema import DeleteResponse, UserCreateRequest, UserResponse
+from application.responses import RawJSONResponse
+from application.route import SessionRoute
+from user.api.schema import (
+    DeleteResponse,
+    UserCreateRequest,
+    UserResponse,
+    UserStatsResponse,
+    dump_user,
+)
 from user.domain.model import User
 
 
@@ -15,7 +23,10 @@ BOT_TOKEN = getenv("BOT_TOKEN")
 api_key_header = APIKeyHeader(name="Authorization", auto_error=False)
 
 user_router = APIRouter(
-    prefix="/user", tags=["users"], dependencies=[Depends(verify_bot_token)]
+    prefix="/user",
+    tags=["users"],
+    dependencies=[Depends(verify_bot_token)],
+    route_class=SessionRoute,
 )
 
 
@@ -24,15 +35,55 @@ async def create_user(
     request: UserCreateRequest, tracker: TaskTrackerApp = Depends(get_app_instance)
 ):
     user: User = await tracker.users.register_user(request)
-    return user
+    return RawJSONResponse(dump_user(user))
+
+
+@user_router.put("/by-telegram/{telegram_id}", response_model=UserResponse)
+async def get_or_create_user(
+    telegram_id: int, tracker: TaskTrackerApp = Depends(get_app_instance)
+):
+    """
+    Идемпотентная регистрация по telegram_id (например, на /start).
+
+    Новый пользователь создается одним запросом и возвращается с кодом 201,
+    уже зарегистрированный — с кодом 200.
+    """
+    user, created = await tracker.users.get_or_create_user(telegram_id)
+
+    return RawJSONResponse(dump_user(user), status_code=201 if created else 200)
+
+
+@user_router.get("/{user_id}/stats", response_model=UserStatsResponse)
+async def get_user_stats(
+    user_id: int,
+    tracker: TaskTrackerApp = Depends(get_app_instance),
+):
+    """Число всех, открытых и выполненных задач пользователя."""
+    counts = await tracker.tasks.user_counts(user_id)
+
+    return UserStatsResponse(total=counts.total, open=counts.open, done=counts.done)
 
 
 @user_router.delete("/{user_id}", response_model=DeleteResponse)
 async def delete_user(
     user_id: int,
+    response: Response,
+    background: bool = False,
     tracker: TaskTrackerApp = Depends(get_app_instance),
 ):
-    """Удаление пользователя (только для бота/админа)"""
+    """
+    Удаление пользователя вместе с задачами (только для бота/админа).
+
+    С background=true задачи удаляются в фоне пачками, а ответ 202
+    приходит сразу; пользователь исчезает после последней пачки.
+    """
+    if background:
+        await tracker.users.get_user(user_id)  # 404, если пользователя нет
+        tracker.purger.submit(user_id)
+        response.status_code = 202
+
+        return DeleteResponse(success=True)
+
     success = await tracker.users.delete_user(user_id)
 
     return DeleteResponse(success=success)
@@ -1,5 +1,6 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict, TypeAdapter
 
+from user.domain.model import User
 from user.dto import RegisterUserDTO
 
 
@@ -11,9 +12,23 @@ class UserResponse(BaseModel):
     id: int
     telegram_id: int
 
-    class ConfigDict:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class DeleteResponse(BaseModel):
     success: bool
+
+
+class UserStatsResponse(BaseModel):
+    total: int
+    open: int
+    done: int
+
+
+# Доменный User кодируется в JSON напрямую (см. task.api.schema.dump_task)
+USER_RESPONSE_FIELDS = set(UserResponse.model_fields)
+user_serializer = TypeAdapter(User)
+
+
+def dump_user(user: User) -> bytes:
+    return user_serializer.dump_json(user, include=USER_RESPONSE_FIELDS)
@@ -1,3 +1,5 @@
+from typing import Tuple
+
 from user.service import User, UserService
 from user.dto import RegisterUserDTO
 
@@ -11,6 +13,9 @@ class UserApp:
     async def register_user(self, data: RegisterUserDTO) -> User:
         return await self.user_service.register_user(data.telegram_id)
 
+    async def get_or_create_user(self, telegram_id: int) -> Tuple[User, bool]:
+        return await self.user_service.get_or_create_user(telegram_id)
+
     async def get_user(self, id: int) -> User:
         user: User = await self.user_service.get_user(id)
 
@@ -0,0 +1,89 @@
+from typing import Dict, Iterable, Optional
+
+from infrastructure.cache import LRUCache
+from user.domain.repository import User, UserRepository
+
+
+class CachedUserRepository(UserRepository):
+    """
+    Кэширующая обертка над UserRepository.
+
+    Связка telegram_id -> User не меняется за время жизни пользователя,
+    поэтому хранится в общем для процесса LRU-кэше. При удалении запись
+    сбрасывает SQLAlchemyUserRepository после COMMIT; в других процессах
+    она живет до истечения TTL.
+    """
+
+    def __init__(self, inner: UserRepository, cache: LRUCache):
+        self.inner = inner
+        self.cache = cache
+
+    async def save(self, user: User) -> User:
+        return await self.inner.save(user)
+
+    async def create_by_telegram_id(self, telegram_id: int) -> Optional[User]:
+        """
+        Всегда спрашивает базу: запись в кэше может пережить удаление
+        пользователя другим процессом. Новая строка заменяет устаревшую запись.
+        """
+        user = await self.inner.create_by_telegram_id(telegram_id)
+
+        if user is not None:
+            self.cache.set(telegram_id, user)
+
+        return user
+
+    async def get_user(self, user_id: int) -> User:
+        return await self.inner.get_user(user_id)
+
+    async def exists_by_telegram_id(self, telegram_id: int) -> bool:
+        if self.cache.get(telegram_id) is not None:
+            return True
+
+        return await self.inner.exists_by_telegram_id(telegram_id)
+
+    async def get_by_telegram_id(self, telegram_id: int) -> User:
+        """Получает пользователя по telegram_id, при промахе — одним запросом."""
+        user = self.cache.get(telegram_id)
+
+        if user is None:
+            user = await self.inner.get_by_telegram_id(telegram_id)
+            self.cache.set(telegram_id, user)
+
+        return user
+
+    async def get_user_by_telegram_id(self, telegram_id: int) -> int:
+        user = await self.get_by_telegram_id(telegram_id)
+
+        return user.id
+
+    async def get_users(self, user_ids: Iterable[int]) -> Dict[int, User]:
+        return await self.inner.get_users(user_ids)
+
+    async def get_users_by_telegram_ids(
+        self, telegram_ids: Iterable[int]
+    ) -> Dict[int, User]:
+        """Отдает найденное в кэше, а за остальными идет в базу одним запросом."""
+        users: Dict[int, User] = {}
+        missing = []
+
+        for telegram_id in set(telegram_ids):
+            user = self.cache.get(telegram_id)
+
+            if user is None:
+                missing.append(telegram_id)
+            else:
+                users[telegram_id] = user
+
+        if missing:
+            fetched = await self.inner.get_users_by_telegram_ids(missing)
+
+            for telegram_id, user in fetched.items():
+                self.cache.set(telegram_id, user)
+
+            users.update(fetched)
+
+        return users
+
+    async def delete_user(self, id: int) -> bool:
+        return await self.inner.delete_user(id)
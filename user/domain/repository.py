@@ -1,4 +1,4 @@
-from typing import Protocol
+from typing import Dict, Iterable, Optional, Protocol
 
 from user.domain.model import User
 
@@ -7,6 +7,8 @@ class UserRepository(Protocol):
 
     async def save(self, user: User) -> User: ...
 
+    async def create_by_telegram_id(self, telegram_id: int) -> Optional[User]: ...
+
     async def get_user(self, user_id: int) -> User: ...
 
     # async def exists_by_nickname(self, nickname: str) -> bool:
@@ -17,3 +19,11 @@ class UserRepository(Protocol):
     async def delete_user(self, id: int) -> bool: ...
 
     async def get_user_by_telegram_id(self, telegram_id: int) -> int: ...
+
+    async def get_by_telegram_id(self, telegram_id: int) -> User: ...
+
+    async def get_users(self, user_ids: Iterable[int]) -> Dict[int, User]: ...
+
+    async def get_users_by_telegram_ids(
+        self, telegram_ids: Iterable[int]
+    ) -> Dict[int, User]: ...
@@ -0,0 +1,51 @@
+from typing import Callable, Dict, Iterable, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from infrastructure.db.write_pipeline import WritePipeline
+from user.domain.repository import User, UserRepository
+
+
+class PipelinedUserRepository(UserRepository):
+    """Обертка над UserRepository, отправляющая записи в WritePipeline."""
+
+    def __init__(
+        self,
+        inner: UserRepository,
+        pipeline: WritePipeline,
+        make_repo: Callable[[AsyncSession], UserRepository],
+    ):
+        self.inner = inner
+        self.pipeline = pipeline
+        self.make_repo = make_repo
+
+    async def save(self, user: User) -> User:
+        return await self.pipeline.submit(lambda s: self.make_repo(s).save(user))
+
+    async def create_by_telegram_id(self, telegram_id: int) -> Optional[User]:
+        return await self.pipeline.submit(
+            lambda s: self.make_repo(s).create_by_telegram_id(telegram_id)
+        )
+
+    async def get_user(self, user_id: int) -> User:
+        return await self.inner.get_user(user_id)
+
+    async def exists_by_telegram_id(self, telegram_id: int) -> bool:
+        return await self.inner.exists_by_telegram_id(telegram_id)
+
+    async def get_by_telegram_id(self, telegram_id: int) -> User:
+        return await self.inner.get_by_telegram_id(telegram_id)
+
+    async def get_user_by_telegram_id(self, telegram_id: int) -> int:
+        return await self.inner.get_user_by_telegram_id(telegram_id)
+
+    async def get_users(self, user_ids: Iterable[int]) -> Dict[int, User]:
+        return await self.inner.get_users(user_ids)
+
+    async def get_users_by_telegram_ids(
+        self, telegram_ids: Iterable[int]
+    ) -> Dict[int, User]:
+        return await self.inner.get_users_by_telegram_ids(telegram_ids)
+
+    async def delete_user(self, id: int) -> bool:
+        return await self.pipeline.submit(lambda s: self.make_repo(s).delete_user(id))
@@ -1,3 +1,5 @@
+from typing import Tuple
+
 from user.domain.repository import User, UserRepository
 
 
@@ -6,12 +8,21 @@ class UserService:
         self.user_repo = user_repo
 
     async def register_user(self, telegram_id: int) -> User:
-        if await self.user_repo.exists_by_telegram_id(telegram_id):
+        user = await self.user_repo.create_by_telegram_id(telegram_id)
+
+        if user is None:
             raise ValueError("уже зарегестрирован")
 
-        user = User(id=None, telegram_id=telegram_id)
+        return user
+
+    async def get_or_create_user(self, telegram_id: int) -> Tuple[User, bool]:
+        """Возвращает пользователя по telegram_id и признак, что он только что создан."""
+        user = await self.user_repo.create_by_telegram_id(telegram_id)
+
+        if user is not None:
+            return user, True
 
-        return await self.user_repo.save(user)
+        return await self.user_repo.get_by_telegram_id(telegram_id), False
 
     async def get_user(self, id: int = 0) -> User:
 
@@ -1,16 +1,29 @@
+from typing import Dict, Iterable, Optional
+
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import delete, select
 
 from exceptions import UserNotFoundError
-from infrastructure.db.models import DBUser
+from infrastructure.cache import LRUCache
+from infrastructure.db.database import mark_written, on_commit
+from infrastructure.db.models import DBTask, DBTaskArchive, DBUser, DBUserTaskCounts
+from task.cache import TaskCache
 from user.domain.repository import User, UserRepository
 
 
 class SQLAlchemyUserRepository(UserRepository):
     """Реализация репозитория пользователя через SQLAlchemy."""
 
-    def __init__(self, session: AsyncSession):
+    def __init__(
+        self,
+        session: AsyncSession,
+        task_cache: Optional[TaskCache] = None,
+        telegram_cache: Optional[LRUCache] = None,
+    ):
         self.session = session
+        self.task_cache = task_cache
+        self.telegram_cache = telegram_cache
 
     async def save(self, user: User) -> User:
         """Сохраняет или обновляет пользователя в базе данных."""
@@ -21,6 +34,7 @@ class SQLAlchemyUserRepository(UserRepository):
             await self.session.flush()
             await self.session.refresh(db_user)
             user = User(id=db_user.id, telegram_id=db_user.telegram_id)
+            mark_written(self.session, users=[user.id])
         else:
             # Обновление существующего пользователя
             db_user = await self.session.get(DBUser, user.id)
@@ -30,6 +44,32 @@ class SQLAlchemyUserRepository(UserRepository):
 
         return user
 
+    async def create_by_telegram_id(self, telegram_id: int) -> Optional[User]:
+        """
+        Создает пользователя одним INSERT ... ON CONFLICT DO NOTHING RETURNING.
+
+        None — пользователь с таким telegram_id уже есть. Параллельные
+        регистрации одного telegram_id не падают на уникальном индексе:
+        строку вставляет ровно одна из них.
+        """
+        dialect = self.session.get_bind().dialect.name
+        upsert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+        stmt = (
+            upsert(DBUser)
+            .values(telegram_id=telegram_id)
+            .on_conflict_do_nothing(index_elements=[DBUser.telegram_id])
+            .returning(DBUser.id, DBUser.telegram_id)
+        )
+        result = await self.session.execute(stmt)
+        row = result.one_or_none()
+
+        if row is None:
+            return None
+
+        mark_written(self.session, users=[row.id])
+
+        return User(id=row.id, telegram_id=row.telegram_id)
+
     async def get_user(self, user_id: int) -> User:
         """Получает пользователя по внутреннему ID."""
         db_user = await self.session.get(DBUser, user_id)
@@ -57,13 +97,80 @@ class SQLAlchemyUserRepository(UserRepository):
 
         return user_id
 
-    async def delete_user(self, id: int) -> bool:
-        """Удаляет пользователя по ID."""
-        db_user = await self.session.get(DBUser, id)
+    async def get_by_telegram_id(self, telegram_id: int) -> User:
+        """Получает пользователя по telegram_id одним запросом."""
+        stmt = select(DBUser.id, DBUser.telegram_id).where(
+            DBUser.telegram_id == telegram_id
+        )
+        result = await self.session.execute(stmt)
+        row = result.one_or_none()
 
-        if db_user:
-            await self.session.delete(db_user)
-            await self.session.flush()
-            return True
+        if row is None:
+            raise UserNotFoundError("Пользователь по telegram_id не найден")
+
+        return User(id=row.id, telegram_id=row.telegram_id)
+
+    async def get_users(self, user_ids: Iterable[int]) -> Dict[int, User]:
+        """Получает пользователей по набору ID одним запросом."""
+        stmt = select(DBUser.id, DBUser.telegram_id).where(DBUser.id.in_(set(user_ids)))
+        result = await self.session.execute(stmt)
+
+        return {row.id: User(id=row.id, telegram_id=row.telegram_id) for row in result}
 
-        return False
+    async def get_users_by_telegram_ids(
+        self, telegram_ids: Iterable[int]
+    ) -> Dict[int, User]:
+        """Получает пользователей по набору telegram_id одним запросом."""
+        stmt = select(DBUser.id, DBUser.telegram_id).where(
+            DBUser.telegram_id.in_(set(telegram_ids))
+        )
+        result = await self.session.execute(stmt)
+
+        return {
+            row.telegram_id: User(id=row.id, telegram_id=row.telegram_id)
+            for row in result
+        }
+
+    async def delete_user(self, id: int) -> bool:
+        """
+        Удаляет пользователя вместе с задачами, архивом и счетчиками.
+
+        Четыре DELETE по индексам независимо от числа задач, без загрузки
+        строк в ORM. Внешние ключи с ON DELETE CASCADE сделали бы то же
+        самое, но явные запросы не зависят от PRAGMA foreign_keys в SQLite
+        и возвращают ID задач для сброса кэша. Кэши сбрасываются после
+        COMMIT: до него параллельный запрос вернул бы в кэш еще живую строку.
+        """
+        result = await self.session.execute(
+            delete(DBTask).where(DBTask.user_id == id).returning(DBTask.id)
+        )
+        task_ids = list(result.scalars())
+        await self.session.execute(
+            delete(DBTaskArchive).where(DBTaskArchive.user_id == id)
+        )
+        await self.session.execute(
+            delete(DBUserTaskCounts).where(DBUserTaskCounts.user_id == id)
+        )
+        result = await self.session.execute(
+            delete(DBUser).where(DBUser.id == id).returning(DBUser.telegram_id)
+        )
+        telegram_id = result.scalar_one_or_none()
+
+        if telegram_id is None:
+            return False
+
+        mark_written(self.session, users=[id], tasks=task_ids)
+
+        if self.telegram_cache is not None:
+            telegram_cache = self.telegram_cache
+
+            async def forget_user() -> None:
+                telegram_cache.pop(telegram_id)
+
+            on_commit(self.session, forget_user)
+
+        if self.task_cache is not None and task_ids:
+            cache = self.task_cache
+            on_commit(self.session, lambda: cache.invalidate(task_ids))
+
+        return True